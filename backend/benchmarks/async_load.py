@@ -0,0 +1,155 @@
+"""
+Throughput of a hot read route on the sync stack vs the async stack as
+concurrency grows past Starlette's threadpool (40 threads by default).
+
+Both variants serve ``GET /api/products/{id}/reviews``: "sync" is the route
+as it was before (plain ``def`` + ``get_db``, run in the threadpool), "async"
+is the current one (``async def`` + ``get_async_db``). Each reviews query is
+given a fixed artificial latency through a SQLite function, standing in for
+a network round trip to Postgres; the database work itself stays trivial, so
+the numbers show how many requests can wait on the database at once.
+
+Usage (from backend/)::
+
+    python benchmarks/async_load.py [--latency-ms 200] [--requests 400]
+        [--concurrency 10,40,80,160,320]
+
+A temporary SQLite database is always used.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+_scratch = Path(tempfile.mkdtemp()) / "bench.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{_scratch}"
+# Keep the sync pool out of the way: the threadpool is what is measured.
+os.environ.setdefault("DB_POOL_SIZE", "400")
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.api.deps import get_db  # noqa: E402
+from app.api.routes.reviews import router as reviews_router  # noqa: E402
+from app.db.migrate import upgrade_database  # noqa: E402
+from app.db.session import SessionLocal, async_engine, engine  # noqa: E402
+from app.models.product import Category, Product  # noqa: E402
+from app.models.review import Review  # noqa: E402
+from app.schemas.review import ReviewOut  # noqa: E402
+
+PRODUCT_ID = 1
+
+
+def install_latency(latency_ms: float) -> None:
+    """Make every reviews query wait ``latency_ms`` inside the driver.
+
+    The function is deterministic with a constant argument, so SQLite
+    evaluates it once per statement rather than once per row.
+    """
+
+    def sleep_ms(ms: float) -> int:
+        time.sleep(ms / 1000)
+        return 1
+
+    def on_connect(dbapi_connection, _record) -> None:
+        dbapi_connection.create_function("sleep_ms", 1, sleep_ms, deterministic=True)
+
+    def add_latency(_conn, _cursor, statement, parameters, _context, _many):
+        if "FROM reviews" in statement:
+            statement = statement.replace(
+                "\nWHERE ", f"\nWHERE sleep_ms({latency_ms}) AND ", 1)
+        return statement, parameters
+
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "connect", on_connect)
+        event.listen(target, "before_cursor_execute", add_latency, retval=True)
+
+
+def seed() -> None:
+    upgrade_database(engine)
+    db = SessionLocal()
+    try:
+        db.add(Category(id=1, slug="bench", name="Bench"))
+        db.add(Product(id=PRODUCT_ID, name="Bench product", price=1000,
+                       category_id=1, active=True))
+        for n in range(5):
+            db.add(Review(product_id=PRODUCT_ID, name="Bench", email="bench@example.com",
+                          title=f"Review {n}", content="Fine.", rating=5, approved=True))
+        db.commit()
+    finally:
+        db.close()
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(reviews_router, prefix="/async")
+
+    @app.get("/sync/products/{product_id}/reviews", response_model=List[ReviewOut])
+    def sync_reviews(product_id: int, db: Session = Depends(get_db),
+                     skip: int = 0, limit: int = 100):
+        return db.query(Review).filter(
+            Review.product_id == product_id,
+            Review.approved.is_(True),
+        ).offset(skip).limit(limit).all()
+
+    return app
+
+
+async def run(client: httpx.AsyncClient, path: str, total: int,
+              concurrency: int) -> tuple[float, float]:
+    latencies: list[float] = []
+    pending = iter(range(total))
+
+    async def worker() -> None:
+        for _ in pending:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return total / elapsed, statistics.quantiles(latencies, n=100)[94] * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", default="10,40,80,160,320")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    install_latency(args.latency_ms)
+    seed()
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for variant in ("sync", "async"):
+            await run(client, f"/{variant}/products/{PRODUCT_ID}/reviews", 20, 10)  # warm up
+
+        print(f"{args.latency_ms:g} ms per query, {args.requests} requests per level\n")
+        print(f"{'concurrency':>11}  {'sync req/s':>10}  {'p95 ms':>7}  "
+              f"{'async req/s':>11}  {'p95 ms':>7}")
+        for level in levels:
+            row = [f"{level:>11}"]
+            for variant in ("sync", "async"):
+                rate, p95 = await run(client, f"/{variant}/products/{PRODUCT_ID}/reviews",
+                                      args.requests, level)
+                row.append(f"{rate:>{10 if variant == 'sync' else 11}.0f}  {p95:>7.1f}")
+            print("  ".join(row))
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""
+Checkout latency and SQL statement count as the cart grows.
+
+Posts orders of increasing size to ``POST /api/orders`` against a scratch
+SQLite database and reports the median latency and the number of statements
+each checkout issues. ``--rtt-ms`` adds a fixed delay to every statement to
+stand in for the network round trip to a real database server, which is
+where per-line queries hurt most.
+
+Usage (from backend/)::
+
+    python benchmarks/checkout.py [--sizes 1,5,10,20,50] [--rounds 20] [--rtt-ms 1]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+_scratch = Path(tempfile.mkdtemp()) / "bench.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{_scratch}"
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.api.routes.orders import router as orders_router  # noqa: E402
+from app.db.migrate import upgrade_database  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.product import Category, Inventory, Product  # noqa: E402
+from app.services.catalog_listing import rebuild_listing  # noqa: E402
+
+
+def seed(products: int) -> None:
+    upgrade_database(engine)
+    db = SessionLocal()
+    try:
+        db.add(Category(id=1, slug="bench", name="Bench"))
+        for pid in range(1, products + 1):
+            db.add(Product(id=pid, name=f"Product {pid}", price=1000 + pid,
+                           category_id=1, active=True))
+            db.add(Inventory(product_id=pid, current_stock=10**9, reserved_stock=0))
+        db.flush()
+        rebuild_listing(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def order_payload(size: int) -> dict:
+    return {
+        "customer": {"email": "bench@example.com", "firstName": "Bench",
+                     "lastName": "User", "phone": "+70000000000"},
+        "shipping": {"method": "pickup"},
+        "payment": {"method": "cash"},
+        "items": [{"productId": pid, "quantity": 1, "price": 1000 + pid}
+                  for pid in range(1, size + 1)],
+        "totalAmount": 0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1,5,10,20,50")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    seed(max(sizes))
+    statements = 0
+
+    def on_execute(*_args) -> None:
+        nonlocal statements
+        statements += 1
+        if args.rtt_ms:
+            time.sleep(args.rtt_ms / 1000)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+
+    app = FastAPI()
+    app.include_router(orders_router, prefix="/api")
+    client = TestClient(app)
+    client.post("/api/orders", json=order_payload(1)).raise_for_status()  # warm up
+
+    print(f"{args.rtt_ms:g} ms simulated round trip, median of {args.rounds}\n")
+    print(f"{'cart lines':>10}  {'statements':>10}  {'median ms':>9}")
+    for size in sizes:
+        payload = order_payload(size)
+        timings = []
+        for _ in range(args.rounds):
+            statements = 0
+            started = time.perf_counter()
+            client.post("/api/orders", json=payload).raise_for_status()
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"{size:>10}  {statements:>10}  {statistics.median(timings):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
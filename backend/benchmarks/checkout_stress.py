@@ -0,0 +1,129 @@
+"""
+Concurrent checkouts against a low-stock product: no overselling allowed.
+
+Fires ``--orders`` simultaneous ``POST /api/orders`` requests from a pool of
+``--threads`` threads, each buying one unit of a product that only has
+``--stock`` units. Exactly ``--stock`` orders must succeed, every other one
+must be refused with 400, and the product must end at zero stock. Also
+reports how many checkouts per second got through.
+
+Usage (from backend/)::
+
+    python benchmarks/checkout_stress.py [--orders 300] [--threads 64] [--stock 25]
+    DATABASE_URL=postgresql://... python benchmarks/checkout_stress.py
+
+Without DATABASE_URL a temporary SQLite file is used. Against another
+database the target must be migrated and must not contain product id 1;
+the rows created are left in place. Exits non-zero if a check fails.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Barrier
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+if not os.environ.get("DATABASE_URL"):
+    _scratch = Path(tempfile.mkdtemp()) / "bench.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{_scratch}"
+os.environ.setdefault("DB_POOL_SIZE", "64")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api.routes.orders import router as orders_router  # noqa: E402
+from app.db.migrate import upgrade_database  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.order import OrderItem  # noqa: E402
+from app.models.product import Category, Inventory, Product  # noqa: E402
+
+PRODUCT_ID = 1
+
+
+def seed(stock: int) -> None:
+    upgrade_database(engine)
+    db = SessionLocal()
+    try:
+        if db.get(Category, 1) is None:
+            db.add(Category(id=1, slug="bench", name="Bench"))
+        db.add(Product(id=PRODUCT_ID, name="Last units", price=1000,
+                       category_id=1, active=True))
+        db.add(Inventory(product_id=PRODUCT_ID, current_stock=stock, reserved_stock=0))
+        db.commit()
+    finally:
+        db.close()
+
+
+ORDER = {
+    "customer": {"email": "bench@example.com", "firstName": "Bench",
+                 "lastName": "User", "phone": "+70000000000"},
+    "shipping": {"method": "pickup"},
+    "payment": {"method": "cash"},
+    "items": [{"productId": PRODUCT_ID, "quantity": 1, "price": 1000}],
+    "totalAmount": 1000,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--orders", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--stock", type=int, default=25)
+    args = parser.parse_args()
+
+    seed(args.stock)
+    app = FastAPI()
+    app.include_router(orders_router, prefix="/api")
+    # Outside a ``with`` block every request runs on its own event loop, so
+    # the threads really do hit the database at the same time.
+    client = TestClient(app)
+    start_line = Barrier(args.threads)
+
+    def checkout(index: int) -> int:
+        if index < args.threads:
+            start_line.wait()
+        return client.post("/api/orders", json=ORDER).status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.threads) as pool:
+        statuses = Counter(pool.map(checkout, range(args.orders)))
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    try:
+        inventory = db.get(Inventory, PRODUCT_ID)
+        sold = sum(
+            item.quantity
+            for item in db.query(OrderItem).filter(OrderItem.product_id == PRODUCT_ID)
+        )
+        final_stock = inventory.current_stock
+    finally:
+        db.close()
+
+    print(f"{args.orders} checkouts from {args.threads} threads in {elapsed:.2f}s "
+          f"({args.orders / elapsed:.0f}/s)")
+    print(f"responses: {dict(sorted(statuses.items()))}")
+    print(f"stock {args.stock} -> {final_stock}, units sold {sold}")
+
+    failures = []
+    if statuses[200] != args.stock:
+        failures.append(f"expected {args.stock} successful orders, got {statuses[200]}")
+    if statuses[200] + statuses[400] != args.orders:
+        failures.append("some checkouts failed with an unexpected status")
+    if sold != args.stock or final_stock != 0:
+        failures.append(f"oversold: {sold} units sold from {args.stock}, stock now {final_stock}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        raise SystemExit(1)
+    print("OK: no overselling")
+
+
+if __name__ == "__main__":
+    main()
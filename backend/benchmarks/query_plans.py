@@ -0,0 +1,169 @@
+"""
+Query plans and timings for hot read paths before and after the
+``0003_performance_indexes`` migration.
+
+Builds a scratch database, migrates it to the revision just before the
+indexes, fills it with synthetic data, prints ``EXPLAIN`` output and the
+median latency of each query, then upgrades to head and repeats.
+
+Usage (from backend/)::
+
+    python benchmarks/query_plans.py [--products 20000] [--orders 50000]
+    DATABASE_URL=postgresql://... python benchmarks/query_plans.py --keep
+
+Without DATABASE_URL a temporary SQLite file is used. The target database
+must be empty; it is dropped back to base afterwards unless --keep is given.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+if not os.environ.get("DATABASE_URL"):
+    _scratch = Path(tempfile.mkdtemp()) / "bench.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{_scratch}"
+
+from alembic import command  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from app.db.migrate import alembic_config  # noqa: E402
+from app.db.session import engine  # noqa: E402
+
+
+BEFORE_REVISION = "0002_catalog_listing"
+
+QUERIES = {
+    "catalog: category sorted by price": (
+        "SELECT id FROM products WHERE active = :active AND category_id = :category "
+        "ORDER BY price ASC LIMIT 12"
+    ),
+    "catalog: newest products": (
+        "SELECT id FROM products WHERE active = :active ORDER BY created_at DESC LIMIT 12"
+    ),
+    "galleries for a page": (
+        "SELECT id, url FROM product_images WHERE product_id IN (:p1, :p2, :p3, :p4) "
+        "ORDER BY product_id, sort"
+    ),
+    "approved reviews for a product": (
+        "SELECT id FROM reviews WHERE product_id = :product AND approved = :active "
+        "ORDER BY created_at DESC LIMIT 20"
+    ),
+    "my orders by phone or email": (
+        "SELECT id FROM orders WHERE customer_phone = :phone OR customer_email = :email "
+        "ORDER BY created_at DESC"
+    ),
+    "admin: latest orders": "SELECT id FROM orders ORDER BY created_at DESC LIMIT 50",
+}
+
+
+def _params(products: int) -> dict:
+    picks = random.sample(range(1, products + 1), 4)
+    return {
+        "active": True,
+        "category": random.randint(1, 20),
+        "product": picks[0],
+        "p1": picks[0], "p2": picks[1], "p3": picks[2], "p4": picks[3],
+        "phone": f"+7900{random.randint(0, 9999):07d}",
+        "email": f"user{random.randint(0, 9999)}@example.com",
+    }
+
+
+def seed(products: int, orders: int) -> None:
+    now = datetime.utcnow()
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO categories (id, slug, name) VALUES (:id, :slug, :name)"),
+                     [{"id": i, "slug": f"cat-{i}", "name": f"Category {i}"} for i in range(1, 21)])
+        conn.execute(
+            text("INSERT INTO products (id, name, description, price, category_id, active, created_at) "
+                 "VALUES (:id, :name, '', :price, :category, :active, :created)"),
+            [{"id": i, "name": f"Product {i}", "price": rng.randint(100, 200000),
+              "category": rng.randint(1, 20), "active": rng.random() > 0.1,
+              "created": now - timedelta(minutes=i)} for i in range(1, products + 1)])
+        conn.execute(
+            text("INSERT INTO product_images (product_id, url, sort) VALUES (:product, :url, :sort)"),
+            [{"product": i, "url": f"/uploads/products/{i}/{s}.jpg", "sort": s}
+             for i in range(1, products + 1) for s in range(1, 4)])
+        conn.execute(
+            text("INSERT INTO reviews (product_id, name, email, title, content, rating, helpful_count, "
+                 "approved, created_at) VALUES (:product, 'n', 'e', 't', 'c', 5, 0, :approved, :created)"),
+            [{"product": rng.randint(1, products), "approved": rng.random() > 0.3,
+              "created": now - timedelta(minutes=i)} for i in range(products * 2)])
+        conn.execute(
+            text("INSERT INTO orders (order_number, status, total_amount, customer_first_name, "
+                 "customer_last_name, customer_email, customer_phone, shipping_method, payment_method, "
+                 "created_at, updated_at) VALUES (:number, 'pending', 1000, 'a', 'b', :email, :phone, "
+                 "'pickup', 'cash', :created, :created)"),
+            [{"number": f"ORD-{i:06d}", "email": f"user{rng.randint(0, 9999)}@example.com",
+              "phone": f"+7900{rng.randint(0, 9999):07d}",
+              "created": now - timedelta(minutes=i)} for i in range(1, orders + 1)])
+
+
+def explain(sql: str, params: dict) -> list[str]:
+    with engine.connect() as conn:
+        if conn.dialect.name == "sqlite":
+            rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params).all()
+            return [row[-1] for row in rows]
+        rows = conn.execute(text(f"EXPLAIN {sql}"), params).all()
+        return [row[0] for row in rows]
+
+
+def time_query(sql: str, products: int, repeat: int) -> float:
+    samples = []
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            params = _params(products)
+            started = time.perf_counter()
+            conn.execute(text(sql), params).all()
+            samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def report(label: str, products: int, repeat: int) -> dict[str, float]:
+    print(f"\n=== {label} ===")
+    timings = {}
+    for name, sql in QUERIES.items():
+        plan = explain(sql, _params(products))
+        timings[name] = time_query(sql, products, repeat)
+        print(f"\n{name}: {timings[name]:.3f} ms (median of {repeat})")
+        for line in plan:
+            print(f"    {line}")
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare query plans before/after performance indexes")
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="leave the migrated database in place")
+    args = parser.parse_args()
+
+    config = alembic_config()
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    command.upgrade(config, BEFORE_REVISION)
+    try:
+        seed(args.products, args.orders)
+        before = report(f"before ({BEFORE_REVISION})", args.products, args.repeat)
+        command.upgrade(config, "head")
+        after = report("after (head)", args.products, args.repeat)
+
+        print("\n=== summary (median ms) ===")
+        for name in QUERIES:
+            ratio = before[name] / after[name] if after[name] else float("inf")
+            print(f"{name:<36} {before[name]:>9.3f} -> {after[name]:>9.3f}  x{ratio:.1f}")
+    finally:
+        if not args.keep:
+            command.downgrade(config, "base")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Items/second for serialising a page of products, old path vs fast path.
+
+"before" mirrors what the product routes used to do: build validated
+``ProductOut`` models, let FastAPI re-validate them against
+``response_model`` and encode with ``jsonable_encoder`` + ``json.dumps``.
+"after" is the current path: ``product_to_out`` (``model_construct``)
+rendered by ``FastJSONResponse``.
+
+Usage (from backend/)::
+
+    python benchmarks/serialization.py [--items 100] [--rounds 200]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.api.responses import FastJSONResponse  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.models.product import Product, ProductImage  # noqa: E402
+from app.schemas.product import ProductImageOut, ProductOut  # noqa: E402
+from app.services.product_media import product_to_out  # noqa: E402
+
+
+def make_page(count: int) -> list[tuple[Product, list[ProductImage]]]:
+    page = []
+    for pid in range(1, count + 1):
+        product = Product(
+            id=pid,
+            name=f"Product {pid}",
+            description="Складная посадочная площадка диаметром 75 см " * 3,
+            price=1000 + pid,
+            category_id=pid % 20 + 1,
+            active=True,
+        )
+        gallery = [
+            ProductImage(id=pid * 10 + n, product_id=pid,
+                         url=f"/uploads/products/{pid}/{n}.jpg", sort=n)
+            for n in range(1, 5)
+        ]
+        page.append((product, gallery))
+    return page
+
+
+def validated_product_out(product: Product, gallery: list[ProductImage]) -> ProductOut:
+    payload = [ProductImageOut(id=item.id, url=item.url, sort=item.sort) for item in gallery]
+    urls = [item.url for item in payload]
+    return ProductOut(
+        id=product.id,
+        name=product.name,
+        description=product.description,
+        price=product.price,
+        category_id=product.category_id,
+        active=product.active,
+        image=urls[0] if urls else None,
+        images=urls or None,
+        gallery=payload or None,
+    )
+
+
+_response_field = create_response_field(name="response", type_=list[ProductOut], mode="serialization")
+
+
+def before(page) -> bytes:
+    items = [validated_product_out(product, gallery) for product, gallery in page]
+    value, errors = _response_field.validate(items, {}, loc=("response",))
+    assert not errors
+    content = jsonable_encoder(_response_field.serialize(value, mode="json"))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def after(page) -> bytes:
+    items = [product_to_out(product, gallery) for product, gallery in page]
+    return FastJSONResponse(items).body
+
+
+def measure(fn, page, rounds: int) -> float:
+    fn(page)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(page)
+    return len(page) * rounds / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Product serialisation microbenchmark")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    # Keep the legacy uploads lookup out of the measurement.
+    settings.LEGACY_IMAGES_FALLBACK = False
+    page = make_page(args.items)
+    assert json.loads(before(page)) == json.loads(after(page))
+
+    slow = measure(before, page, args.rounds)
+    fast = measure(after, page, args.rounds)
+    print(f"page of {args.items} products, {args.rounds} rounds")
+    print(f"before: {slow:>12,.0f} items/s")
+    print(f"after:  {fast:>12,.0f} items/s  (x{fast / slow:.1f})")
+
+
+if __name__ == "__main__":
+    main()
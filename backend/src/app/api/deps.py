@@ -4,17 +4,29 @@ import jwt
 from typing import Optional
 
 from app.core.security import decode_token
-from app.db.session import SessionLocal
+from app.db.pool_metrics import record_request
+from app.db.session import AsyncSessionLocal, LazySession
 
 
 def get_db():
-    db = SessionLocal()
+    # The session (and its pool connection) only materialises on first use.
+    db = LazySession()
     try:
         yield db
     finally:
+        record_request(db.used_connection)
         db.close()
 
 
+async def get_async_db():
+    # AsyncSession, like Session, only checks out a connection on first use.
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        finally:
+            record_request(db.info.get("used_connection", False))
+
+
 bearer = HTTPBearer(auto_error=False)
 
 
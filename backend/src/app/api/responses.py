@@ -0,0 +1,71 @@
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic_core import to_json
+
+from app.services.response_cache import CachedBody
+
+
+class FastJSONResponse(Response):
+    """JSON response that serialises once, in Rust.
+
+    Accepts pre-encoded ``bytes`` (passed through untouched) or any value
+    pydantic-core can serialise, including model instances, which are dumped
+    with their compiled serializers instead of ``jsonable_encoder`` + ``json``.
+    Returning an instance from a route also skips FastAPI's ``response_model``
+    re-validation, so callers must hand it data that already matches the schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return to_json(content)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison: nginx turns strong ETags into W/ ones when it gzips.
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+def _not_modified(request: Request, cached: CachedBody) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, cached.etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(cached.last_modified) <= since
+    return False
+
+
+def conditional_response(request: Request, cached: CachedBody, cache_control: str) -> Response:
+    """Serve ``cached`` with validators, or a bodiless 304 if the client has it."""
+
+    headers = {
+        "ETag": cached.etag,
+        "Last-Modified": formatdate(cached.last_modified, usegmt=True),
+        "Cache-Control": cache_control,
+    }
+    if _not_modified(request, cached):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(cached.body, headers=headers)
+
+
+def revalidate(max_age: int = 0) -> str:
+    """Cache-Control for public data that may be reused for ``max_age`` seconds
+    and must be revalidated with the ETag afterwards."""
+
+    return f"public, max-age={max_age}, must-revalidate"
@@ -1,15 +1,19 @@
-﻿from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+﻿from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from sqlalchemy.orm import Session
 from sqlalchemy import func, select
-import shutil
-import uuid
 from pathlib import Path
+import logging
 
 from app.api.deps import get_db, require_roles
+from app.api.responses import FastJSONResponse
+from app.db.pool_metrics import pool_snapshot
+from app.db.session import engine
+from app.models.job import Job
 from app.models.product import Category, Product, Inventory, ProductImage
 from app.models.user import User, user_roles_names
 from app.models.role import Role
 from app.schemas.auth import AdminUserOut
+from app.schemas.job import JobOut
 from app.schemas.product import (
     ProductIn,
     ProductOut,
@@ -22,14 +26,26 @@ from app.schemas.product import (
     CategoryUpdate,
 )
 from app.core.config import settings
-from app.services.product_media import products_to_out
+from app.services.catalog_listing import (
+    category_product_ids,
+    refresh_listing,
+    refresh_listing_stock,
+)
+from app.services.product_media import image_file_refs, image_to_out, products_to_out
+from app.services.product_search import apply_search
+from app.services.response_cache import catalog_responses
+from app.services.image_variants import probe_image
+from app.services.jobs import enqueue, requeue
+from app.services.uploads import UploadTooLarge, store_content_addressed
 from app.services.catalog_cache import (
     get_categories_payload,
     invalidate_categories_cache,
+    invalidate_product_counts,
 )
 
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 def _category_to_out(category: Category) -> CategoryOut:
@@ -92,6 +108,8 @@ def admin_create_category(payload: CategoryIn, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(category)
     invalidate_categories_cache()
+    invalidate_product_counts()
+    catalog_responses.purge("categories", f"category:{category.id}")
     return _category_to_out(category)
 
 
@@ -109,11 +127,21 @@ def admin_update_category(category_id: int, payload: CategoryUpdate, db: Session
                 status_code=400, detail="Category with this slug already exists")
     if "parent_id" in update_data:
         _ensure_parent_valid(category, update_data["parent_id"], db)
+    # Only the slug and the parent feed the read model (category_path of
+    # this category's products and of everything below it).
+    moved = any(
+        field in update_data and update_data[field] != getattr(category, field)
+        for field in ("slug", "parent_id")
+    )
     for field, value in update_data.items():
         setattr(category, field, value)
+    if moved:
+        refresh_listing(db, category_product_ids(db, category_id))
     db.commit()
     db.refresh(category)
     invalidate_categories_cache()
+    invalidate_product_counts()
+    catalog_responses.purge("categories", f"category:{category_id}")
     return _category_to_out(category)
 
 
@@ -127,6 +155,8 @@ def admin_delete_category(category_id: int, db: Session = Depends(get_db)):
     category = db.get(Category, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
+    # Detached products and the whole subtree below get new category paths.
+    affected = category_product_ids(db, category_id)
 
     # Reparent children to this category's parent (may be NULL)
     children = db.query(Category).filter(Category.parent_id == category_id).all()
@@ -139,8 +169,12 @@ def admin_delete_category(category_id: int, db: Session = Depends(get_db)):
         p.category_id = None
 
     db.delete(category)
+    refresh_listing(db, affected)
     db.commit()
     invalidate_categories_cache()
+    invalidate_product_counts()
+    catalog_responses.purge(
+        "categories", f"category:{category_id}", "listing")
     return {"success": True}
 
 
@@ -157,7 +191,10 @@ def create_product(payload: ProductIn, db: Session = Depends(get_db)):
     db.flush()
     inv = Inventory(product_id=p.id, current_stock=0, reserved_stock=0)
     db.add(inv)
+    refresh_listing(db, [p.id])
     db.commit()
+    invalidate_product_counts()
+    catalog_responses.purge("listing", f"product:{p.id}")
     db.refresh(p)
     return products_to_out(db, [p])[0]
 
@@ -176,8 +213,7 @@ def admin_list_products(
     if category:
         stmt = stmt.where(Product.category_id == category)
     if q:
-        like = f"%{q}%"
-        stmt = stmt.where(Product.name.ilike(like))
+        stmt, _ = apply_search(stmt, q)
     if active is not None:
         stmt = stmt.where(Product.active == active)
     if sort:
@@ -193,7 +229,7 @@ def admin_list_products(
     offset = max(0, (page - 1) * page_size)
     stmt = stmt.offset(offset).limit(page_size)
     rows = db.execute(stmt).scalars().all()
-    return products_to_out(db, rows)
+    return FastJSONResponse(products_to_out(db, rows))
 
 
 @router.get("/inventory", response_model=list[InventoryOut], dependencies=[Depends(require_roles("admin"))])
@@ -241,8 +277,11 @@ def update_inventory(
 
     # Р С›Р В±Р Р…Р С•Р Р†Р В»РЎРЏР ВµР С Р С•РЎРѓРЎвЂљР В°РЎвЂљР С•Р С”
     inventory_record.current_stock = inventory.current_stock
+    refresh_listing(db, [product_id])
 
     db.commit()
+    invalidate_product_counts()
+    catalog_responses.purge("inventory")
 
     return {
         "success": True,
@@ -279,8 +318,11 @@ def bulk_update_inventory(
         elif update_data.action == "subtract":
             record.current_stock = max(
                 0, record.current_stock - update_data.quantity)
+    refresh_listing_stock(db, [record.product_id for record in inventory_records])
 
     db.commit()
+    invalidate_product_counts()
+    catalog_responses.purge("inventory")
 
     return {"success": True, "updated_count": len(inventory_records)}
 
@@ -315,8 +357,11 @@ def update_product(
     update_data = product_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(product, key, value)
+    refresh_listing(db, [product_id])
 
     db.commit()
+    invalidate_product_counts()
+    catalog_responses.purge("listing", f"product:{product_id}")
     db.refresh(product)
     return products_to_out(db, [product])[0]
 
@@ -327,27 +372,21 @@ def delete_product(
     db: Session = Depends(get_db),
 ):
     """
-    Delete a product along with its images and inventory record. Images are
-    removed from disk if they exist.
+    Delete a product along with its images and inventory record. Image files
+    are removed from disk by a background job after the commit.
     """
     product = db.get(Product, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    # Delete images from filesystem and DB
+    # Delete image rows; a background job removes their files and the
+    # legacy per-product folder once this transaction has committed.
     images = db.query(ProductImage).filter(ProductImage.product_id == product_id).all()
+    enqueue(db, "delete_files", {
+        "images": image_file_refs(images),
+        "dirs": [f"products/{product_id}"],
+    })
     for img in images:
-        # Convert stored URL to filesystem path under uploads dir
-        relative = Path(img.url.lstrip("/"))
-        if relative.parts and relative.parts[0] == "uploads":
-            relative = Path(*relative.parts[1:])
-        file_path = Path(settings.UPLOADS_DIR) / relative
-        try:
-            if file_path.exists():
-                file_path.unlink()
-        except Exception:
-            # Ignore filesystem errors during deletion
-            pass
         db.delete(img)
 
     # Delete inventory record if present
@@ -357,66 +396,150 @@ def delete_product(
 
     # Finally delete the product
     db.delete(product)
+    refresh_listing(db, [product_id])
     db.commit()
+    invalidate_product_counts()
+    catalog_responses.purge("listing", f"product:{product_id}")
+    return {"success": True}
 
-    # Try removing now-empty upload directory
-    try:
-        uploads_dir = Path(settings.UPLOADS_DIR) / "products" / str(product_id)
-        if uploads_dir.exists():
-            uploads_dir.rmdir()
-    except Exception:
-        pass
 
-    return {"success": True}
+_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
 
 
-@router.post("/products/{product_id}/upload-image", dependencies=[Depends(require_roles("admin"))])
-async def upload_product_image(
-    product_id: int,
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-):
-    """
-    Р—Р°РіСЂСѓР¶Р°РµС‚ РёР·РѕР±СЂР°Р¶РµРЅРёРµ С‚РѕРІР°СЂР° Рё С„РёРєСЃРёСЂСѓРµС‚ РµРіРѕ РІ Р±Р°Р·Рµ.
-    """
-    product = db.get(Product, product_id)
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
+def _store_image(db: Session, file: UploadFile, created: list[str]) -> dict:
+    """Copy one upload into content-addressed storage and prepare variants.
 
-    if not file.content_type.startswith("image/"):
+    Returns the ``ProductImage`` column values. The URL of a file this call
+    newly created is appended to ``created`` (for cleanup if the request
+    fails later).
+    """
+    if not (file.content_type or "").startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image")
+    too_large = f"File is larger than {settings.UPLOAD_MAX_BYTES} bytes"
+    if file.size is not None and file.size > settings.UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=too_large)
 
     extension = Path(file.filename or "").suffix.lower()
-    if extension not in {".jpg", ".jpeg", ".png", ".webp", ".gif"}:
+    if extension not in _IMAGE_EXTENSIONS:
         extension = ".jpg"
 
-    relative_folder = Path("products") / str(product_id)
-    upload_dir = Path(settings.UPLOADS_DIR) / relative_folder
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        stored = store_content_addressed(file.file, extension, settings.UPLOAD_MAX_BYTES)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail=too_large)
+    if stored.created:
+        created.append(stored.url)
+
+    # The same photo was uploaded before: reuse its derivatives as well.
+    existing = (
+        db.query(ProductImage)
+        .filter(ProductImage.url == stored.url, ProductImage.variants.isnot(None))
+        .first()
+    )
+    if existing is not None:
+        return {"url": stored.url, "width": existing.width,
+                "height": existing.height, "variants": list(existing.variants or [])}
 
-    file_name = f"{uuid.uuid4().hex}{extension}"
-    file_path = upload_dir / file_name
+    try:
+        width, height = probe_image(stored.relative)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="File must be an image")
+    # Variants are generated by a background job once the row is committed.
+    return {"url": stored.url, "width": width, "height": height, "variants": None}
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
 
-    current_sort = db.query(func.max(ProductImage.sort)).filter(
-        ProductImage.product_id == product_id).scalar() or 0
-    relative_path = relative_folder / file_name
-    image_url = f"/uploads/{relative_path.as_posix()}"
-    image = ProductImage(product_id=product_id,
-                         url=image_url, sort=current_sort + 1)
-    db.add(image)
-    db.commit()
-    db.refresh(image)
+# Grace period before files left by a failed upload are removed.
+_DISCARD_DELAY_SECONDS = 60
+
+
+def _discard_uploads(db: Session, urls: list[str]) -> None:
+    """Queue removal of the files a failed upload created.
+
+    Identical uploads running at the same time share one content-addressed
+    file and both report it as created, so it is not unlinked here: the
+    ``delete_files`` job checks for image rows still using it when it runs.
+    """
+    if not urls:
+        return
+    try:
+        enqueue(db, "delete_files", {"images": [{"url": url, "variants": []} for url in urls]},
+                delay_seconds=_DISCARD_DELAY_SECONDS)
+        db.commit()
+    except Exception:
+        # A stray file is harmless; the upload's own error matters more.
+        db.rollback()
+        logger.exception("Could not queue removal of %s", urls)
+
 
+def _add_product_images(db: Session, product_id: int, files: list[UploadFile]) -> list[ProductImage]:
+    # Copying, hashing and probing block, as does the database work; the
+    # upload routes are plain ``def`` so all of it runs in the threadpool.
+    product = db.get(Product, product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+
+    created: list[str] = []
+    try:
+        prepared = [_store_image(db, file, created) for file in files]
+
+        current_sort = db.query(func.max(ProductImage.sort)).filter(
+            ProductImage.product_id == product_id).scalar() or 0
+        images = [
+            ProductImage(product_id=product_id, sort=current_sort + offset, **values)
+            for offset, values in enumerate(prepared, start=1)
+        ]
+        db.add_all(images)
+        db.flush()
+        for image in images:
+            if image.variants is None:
+                enqueue(db, "generate_image_variants", {"image_id": image.id})
+        refresh_listing(db, [product_id])
+        db.commit()
+    except BaseException:
+        # Whatever went wrong (a bad file, a failed commit, the client going
+        # away), no row of this request points at the files it created.
+        db.rollback()
+        _discard_uploads(db, created)
+        raise
+    catalog_responses.purge(f"product:{product_id}")
+    for image in images:
+        db.refresh(image)
+    return images
+
+
+@router.post("/products/{product_id}/upload-image", dependencies=[Depends(require_roles("admin"))])
+def upload_product_image(
+    product_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    """
+    Р—Р°РіСЂСѓР¶Р°РµС‚ РёР·РѕР±СЂР°Р¶РµРЅРёРµ С‚РѕРІР°СЂР° Рё С„РёРєСЃРёСЂСѓРµС‚ РµРіРѕ РІ Р±Р°Р·Рµ.
+    """
+    image = _add_product_images(db, product_id, [file])[0]
     return {
         "success": True,
         "image_url": image.url,
-        "image": {"id": image.id, "url": image.url, "sort": image.sort},
+        "image": image_to_out(image),
     }
 
 
+@router.post("/products/{product_id}/upload-images", dependencies=[Depends(require_roles("admin"))])
+def upload_product_images(
+    product_id: int,
+    files: list[UploadFile] = File(...),
+    db: Session = Depends(get_db),
+):
+    """
+    Upload a whole gallery in one request; images keep the order of ``files``.
+    """
+    if len(files) > settings.UPLOAD_MAX_FILES:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.UPLOAD_MAX_FILES} files per request")
+    images = _add_product_images(db, product_id, files)
+    return {"success": True, "images": [image_to_out(image) for image in images]}
+
+
 @router.delete("/products/{product_id}/images/{image_id}", dependencies=[Depends(require_roles("admin"))])
 def delete_product_image(
     product_id: int,
@@ -438,15 +561,11 @@ def delete_product_image(
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
 
-    relative = Path(image.url.lstrip("/"))
-    if relative.parts and relative.parts[0] == "uploads":
-        relative = Path(*relative.parts[1:])
-    file_path = Path(settings.UPLOADS_DIR) / relative
-    if file_path.exists():
-        file_path.unlink()
-
+    enqueue(db, "delete_files", {"images": image_file_refs([image])})
     db.delete(image)
+    refresh_listing(db, [product_id])
     db.commit()
+    catalog_responses.purge(f"product:{product_id}")
     return {"success": True}
 
 # ---------- Users management ----------
@@ -508,3 +627,47 @@ def admin_delete_user(user_id: int, db: Session = Depends(get_db)):
 
 
 
+
+# ---------- Metrics ----------
+
+@router.get("/metrics/pool", dependencies=[Depends(require_roles("admin"))])
+def admin_pool_metrics():
+    return pool_snapshot(engine)
+
+
+# ---------- Background jobs ----------
+
+@router.get("/jobs", response_model=list[JobOut], dependencies=[Depends(require_roles("admin"))])
+def admin_list_jobs(
+    db: Session = Depends(get_db),
+    status: str | None = None,
+    kind: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+):
+    query = db.query(Job)
+    if status:
+        query = query.filter(Job.status == status)
+    if kind:
+        query = query.filter(Job.kind == kind)
+    return query.order_by(Job.id.desc()).limit(limit).all()
+
+
+@router.get("/jobs/{job_id}", response_model=JobOut, dependencies=[Depends(require_roles("admin"))])
+def admin_get_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/jobs/{job_id}/retry", response_model=JobOut, dependencies=[Depends(require_roles("admin"))])
+def admin_retry_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "failed":
+        raise HTTPException(status_code=400, detail="Only failed jobs can be retried")
+    requeue(db, job)
+    db.commit()
+    db.refresh(job)
+    return job
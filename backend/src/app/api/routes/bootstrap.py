@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.api.responses import conditional_response, revalidate
+from app.schemas.bootstrap import BootstrapOut
+from app.services.bootstrap import bootstrap_body
+
+
+router = APIRouter()
+
+BOOTSTRAP_MAX_AGE = 60
+
+
+@router.get("/bootstrap", response_model=BootstrapOut)
+def get_bootstrap(request: Request, db: Session = Depends(get_db)):
+    """Everything the SPA needs on first load: the payloads of
+    /settings/public, /categories, /content/hero and /content/promo."""
+
+    return conditional_response(request, bootstrap_body(db), revalidate(BOOTSTRAP_MAX_AGE))
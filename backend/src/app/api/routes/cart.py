@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.models.product import Product
+from app.schemas.cart import CartHoldIn, CartHoldItem, CartHoldOut
+from app.services.cart_holds import (
+    HoldExpired,
+    claim_hold,
+    hold_quantities,
+    place_hold,
+    stock_changed,
+)
+from app.services.catalog_listing import refresh_listing_stock
+from app.services.stock import OutOfStock, release_stock
+
+
+router = APIRouter()
+
+
+@router.post("/cart/hold", response_model=CartHoldOut)
+def hold_cart(payload: CartHoldIn, db: Session = Depends(get_db)):
+    """Set the cart's stock aside while the customer fills in checkout.
+
+    The hold lasts ``CART_HOLD_TTL_SECONDS``; posting again with the returned
+    ``holdToken`` replaces it, and ``POST /api/orders`` with the token turns
+    it into a sale. At most ``CART_HOLD_MAX_UNITS`` of each product are held;
+    the response lists what actually was.
+    """
+
+    requested: dict[int, int] = {}
+    for item in payload.items:
+        requested[item.productId] = requested.get(item.productId, 0) + item.quantity
+    quantities = hold_quantities(requested)
+    products = {
+        product.id: product
+        for product in db.query(Product).filter(Product.id.in_(quantities))
+    }
+    for product_id in quantities:
+        product = products.get(product_id)
+        if not product or not product.active:
+            raise HTTPException(status_code=400, detail=f"Product {product_id} is unavailable")
+
+    try:
+        token, expires_at = place_hold(db, quantities, payload.holdToken)
+    except OutOfStock as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Not enough stock for product {products[exc.product_id].name}")
+    except HoldExpired as exc:
+        db.commit()
+        stock_changed(quantities)
+        raise HTTPException(status_code=409, detail=str(exc))
+    db.commit()
+    stock_changed(quantities)
+    return CartHoldOut(
+        holdToken=token,
+        expiresAt=expires_at,
+        items=[CartHoldItem(productId=pid, quantity=qty) for pid, qty in quantities.items()],
+    )
+
+
+@router.delete("/cart/hold/{token}")
+def release_cart_hold(token: str, db: Session = Depends(get_db)):
+    """Give the hold's stock back early, e.g. when the cart is emptied."""
+
+    released = claim_hold(db, token)
+    if released:
+        release_stock(db, released)
+        refresh_listing_stock(db, released)
+        db.commit()
+        stock_changed(released)
+    return {"success": True}
@@ -1,22 +1,25 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
-from app.data.content_blocks import HERO_SLIDES, PROMO_BLOCKS
+from app.api.responses import conditional_response, revalidate
+from app.services.bootstrap import HERO_BODY, PROMO_BODY
 
 
 router = APIRouter()
 
+CONTENT_MAX_AGE = 300
+
 
 @router.get('/content/hero')
-def content_hero(db: Session = Depends(get_db)):
+def content_hero(request: Request, db: Session = Depends(get_db)):
     del db
     # For now the content is static, but the dependency keeps the interface
     # ready for a future database-backed CMS.
-    return HERO_SLIDES
+    return conditional_response(request, HERO_BODY, revalidate(CONTENT_MAX_AGE))
 
 
 @router.get('/content/promo')
-def content_promo(db: Session = Depends(get_db)):
+def content_promo(request: Request, db: Session = Depends(get_db)):
     del db
-    return PROMO_BLOCKS
+    return conditional_response(request, PROMO_BODY, revalidate(CONTENT_MAX_AGE))
@@ -1,19 +1,38 @@
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, insert, or_
 
 from app.api.deps import get_db, require_roles, get_current_user, get_current_user_id
 from app.models.order import Order, OrderItem
-from app.models.product import Inventory, Product
+from app.models.product import Product
 from app.models.user import User
+from app.services.cart_holds import claim_hold
+from app.services.catalog_cache import invalidate_product_counts
+from app.services.catalog_listing import refresh_listing_stock
+from app.services.idempotency import (
+    IdempotencyKeyBusy,
+    IdempotencyKeyLost,
+    IdempotencyKeyReused,
+    begin_request,
+    complete_request,
+    release_request,
+    request_fingerprint,
+)
+from app.services.order_stats import adjust_order_count, move_order_count, order_total
+from app.services.pagination import Cursor, decode_cursor, encode_cursor, keyset_condition
+from app.services.response_cache import catalog_responses
+from app.services.sequences import next_order_number
+from app.services.stock import OutOfStock, take_stock
 from app.schemas.order import (
     OrderAdminOut,
     OrderCreate,
     OrderItemOut,
     OrderOut,
+    OrdersMeta,
+    OrdersPage,
     OrderSummaryOut,
 )
 
@@ -66,9 +85,28 @@ def _order_to_admin_out(order: Order) -> OrderAdminOut:
 @router.post('/orders', response_model=OrderOut)
 def create_order(
     payload: OrderCreate,
+    response: Response,
     db: Session = Depends(get_db),
     user_id: Optional[int] = Depends(get_current_user_id),
+    idempotency_key: Optional[str] = Header(
+        None, alias='Idempotency-Key', min_length=1, max_length=255),
 ):
+    # Retries carrying the same Idempotency-Key get the first attempt's
+    # order back instead of placing (and paying stock for) another one.
+    claim = None
+    if idempotency_key:
+        scope = f'orders:user:{user_id}' if user_id else 'orders:guest'
+        try:
+            claim = begin_request(scope, idempotency_key, request_fingerprint(payload))
+        except IdempotencyKeyReused as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+        except IdempotencyKeyBusy as exc:
+            raise HTTPException(status_code=409, detail=str(exc))
+        if claim.response is not None:
+            response.headers['Idempotent-Replayed'] = 'true'
+            return OrderOut.model_validate(claim.response)
+
+    completed = False
     try:
         if not payload.items:
             raise HTTPException(status_code=400, detail='Cart is empty')
@@ -84,11 +122,54 @@ def create_order(
         customer_email = (user_obj.email if user_obj and user_obj.email else payload.customer.email)
         customer_phone = (user_obj.phone if user_obj and user_obj.phone else payload.customer.phone)
 
+        # Products are loaded with one IN query; stock is then taken for the
+        # whole cart at once by take_stock, whose guarded UPDATE is what
+        # prevents overselling under concurrent checkouts.
+        product_ids = {item.productId for item in payload.items}
+        products = {
+            product.id: product
+            for product in db.query(Product).filter(Product.id.in_(product_ids))
+        }
+
+        total_amount = 0
+        order_items: list[dict] = []
+        quantities: dict[int, int] = {}
+        for item in payload.items:
+            product = products.get(item.productId)
+            if not product or not product.active:
+                raise HTTPException(
+                    status_code=400, detail=f'Product {item.productId} is unavailable')
+
+            # Products without an inventory record do not block checkout.
+            quantities[product.id] = quantities.get(product.id, 0) + item.quantity
+            unit_price = product.price
+            line_total = unit_price * item.quantity
+            total_amount += line_total
+            order_items.append({
+                "product_id": product.id,
+                "product_name": product.name,
+                "quantity": item.quantity,
+                "unit_price": unit_price,
+                "total_price": line_total,
+            })
+
+        # Allocated before this transaction writes anything: a new block is
+        # fetched in a separate transaction, which SQLite would otherwise block.
+        order_number = next_order_number()
+
+        released = claim_hold(db, payload.holdToken) if payload.holdToken else {}
+        try:
+            take_stock(db, quantities, released)
+        except OutOfStock as exc:
+            db.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail=f'Not enough stock for product {products[exc.product_id].name}')
+
         order = Order(
-            # provisional unique value to avoid unique constraint on flush
-            order_number=f'ORD-TMP-{int(datetime.now().timestamp()*1000)}',
+            order_number=order_number,
             status='pending',
-            total_amount=0,
+            total_amount=total_amount,
             customer_first_name=payload.customer.firstName,
             customer_last_name=payload.customer.lastName,
             customer_email=customer_email,
@@ -100,51 +181,26 @@ def create_order(
             shipping_comment=shipping_comment,
             payment_method=payload.payment.method,
         )
+        # Inserted once, with its final number and total.
         db.add(order)
         db.flush()
-
-        order.order_number = f'ORD-{order.id:06d}'
-
-        total_amount = 0
-        for item in payload.items:
-            product = db.get(Product, item.productId)
-            if not product or not product.active:
-                raise HTTPException(
-                    status_code=400, detail=f'Product {item.productId} is unavailable')
-
-            inventory = db.query(Inventory).filter(
-                Inventory.product_id == product.id).first()
-            # If there is an inventory record, validate availability; if not, do not block checkout.
-            if inventory is not None:
-                available = inventory.current_stock - inventory.reserved_stock
-                if available < item.quantity:
-                    raise HTTPException(
-                        status_code=400, detail=f'Not enough stock for product {product.name}')
-
-            unit_price = product.price
-            line_total = unit_price * item.quantity
-            total_amount += line_total
-
-            db.add(
-                OrderItem(
-                    order_id=order.id,
-                    product_id=product.id,
-                    product_name=product.name,
-                    quantity=item.quantity,
-                    unit_price=unit_price,
-                    total_price=line_total,
-                )
-            )
-
-            if inventory is not None:
-                inventory.current_stock = max(0, inventory.current_stock - item.quantity)
-
-        order.total_amount = total_amount
-        order.updated_at = datetime.utcnow()
-
+        db.execute(insert(OrderItem), [{**line, "order_id": order.id} for line in order_items])
+        refresh_listing_stock(db, set(quantities) | set(released))
+
+        out = _order_to_out(order)
+        adjust_order_count(db, order.status, 1)
+        if claim is not None:
+            try:
+                complete_request(db, claim, out.model_dump(mode='json'))
+            except IdempotencyKeyLost as exc:
+                # A retry owns the key now; this order must not be placed too.
+                db.rollback()
+                raise HTTPException(status_code=409, detail=str(exc))
         db.commit()
-        db.refresh(order)
-        return _order_to_out(order)
+        completed = True
+        invalidate_product_counts()
+        catalog_responses.purge("inventory")
+        return out
     except HTTPException:
         # pass through known HTTP errors
         raise
@@ -152,24 +208,98 @@ def create_order(
         import logging
         logging.exception('Order creation failed')
         raise HTTPException(status_code=500, detail=f'Order creation failed: {str(e)}')
+    finally:
+        if claim is not None and not completed:
+            # End our transaction first: on SQLite it would block the delete.
+            db.rollback()
+            release_request(claim)
+
+
+ADMIN_ORDERS_SORT = 'created_at:desc'
 
 
-@router.get('/admin/orders', response_model=list[OrderSummaryOut], dependencies=[Depends(require_roles('admin'))])
-def admin_list_orders(db: Session = Depends(get_db)):
-    rows = db.query(Order).order_by(Order.created_at.desc()).all()
-    summaries: list[OrderSummaryOut] = []
-    for order in rows:
-        summaries.append(
-            OrderSummaryOut(
-                id=order.id,
-                orderNumber=order.order_number,
-                status=order.status,
-                totalAmount=order.total_amount,
-                createdAt=order.created_at,
-                itemsCount=len(order.items),
-            )
+def _order_summaries(db: Session, rows) -> list[OrderSummaryOut]:
+    """Summaries for ``rows`` (orders or column tuples), with item counts from
+    one grouped query instead of lazy-loading every order's items."""
+
+    ids = [row.id for row in rows]
+    counts = dict(
+        db.query(OrderItem.order_id, func.count(OrderItem.id))
+        .filter(OrderItem.order_id.in_(ids))
+        .group_by(OrderItem.order_id)
+        .all()
+    ) if ids else {}
+    return [
+        OrderSummaryOut(
+            id=row.id,
+            orderNumber=row.order_number,
+            status=row.status,
+            totalAmount=row.total_amount,
+            createdAt=row.created_at,
+            itemsCount=counts.get(row.id, 0),
         )
-    return summaries
+        for row in rows
+    ]
+
+
+@router.get('/admin/orders', response_model=OrdersPage, dependencies=[Depends(require_roles('admin'))])
+def admin_list_orders(
+    db: Session = Depends(get_db),
+    status: Optional[str] = Query(None, max_length=32),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    phone: Optional[str] = Query(None, max_length=32),
+    email: Optional[str] = Query(None, max_length=320),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+):
+    """Newest orders first, one page at a time.
+
+    Pass ``next_cursor`` back as ``cursor`` for the following page. Every
+    filter is served by an index; ``meta.total`` comes from the per-status
+    counters and is only given when filtering by status alone (or not at all).
+    """
+
+    query = db.query(
+        Order.id, Order.order_number, Order.status, Order.total_amount, Order.created_at)
+    if status:
+        query = query.filter(Order.status == status)
+    if created_from:
+        query = query.filter(Order.created_at >= created_from)
+    if created_to:
+        query = query.filter(Order.created_at < created_to)
+    if phone:
+        query = query.filter(Order.customer_phone == phone)
+    if email:
+        query = query.filter(Order.customer_email == email)
+
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail='Invalid cursor')
+        if position.sort != ADMIN_ORDERS_SORT or position.backward:
+            raise HTTPException(status_code=400, detail='Cursor does not match sort order')
+        query = query.filter(
+            keyset_condition(Order.created_at, Order.id, position, descending=True))
+
+    # One extra row tells us whether another page exists without a COUNT.
+    rows = query.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1).all()
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+
+    counted = not (created_from or created_to or phone or email)
+    return OrdersPage(
+        items=_order_summaries(db, rows),
+        meta=OrdersMeta(
+            total=order_total(db, status or None) if counted else None,
+            limit=limit,
+            has_next=has_next,
+        ),
+        next_cursor=encode_cursor(Cursor(
+            sort=ADMIN_ORDERS_SORT, value=rows[-1].created_at, id=rows[-1].id,
+        )) if has_next else None,
+    )
 
 
 @router.get('/admin/orders/{order_id}', response_model=OrderAdminOut, dependencies=[Depends(require_roles('admin'))])
@@ -185,6 +315,7 @@ def admin_update_order_status(order_id: int, status: str, db: Session = Depends(
     order = db.get(Order, order_id)
     if not order:
         raise HTTPException(status_code=404, detail='Order not found')
+    move_order_count(db, order.status, status)
     order.status = status
     order.updated_at = datetime.utcnow()
     db.commit()
@@ -216,18 +347,5 @@ def my_orders(
         .order_by(Order.created_at.desc())
         .all()
     )
-
-    summaries: list[OrderSummaryOut] = []
-    for order in rows:
-        summaries.append(
-            OrderSummaryOut(
-                id=order.id,
-                orderNumber=order.order_number,
-                status=order.status,
-                totalAmount=order.total_amount,
-                createdAt=order.created_at,
-                itemsCount=len(order.items),
-            )
-        )
-    return summaries
+    return _order_summaries(db, rows)
 
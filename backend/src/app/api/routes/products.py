@@ -1,92 +1,278 @@
 from math import ceil
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
-from app.models.product import Inventory, Product
-from app.schemas.product import CategoryOut, ProductOut, ProductsResponse
+from app.api.deps import get_async_db, get_db
+from app.api.responses import FastJSONResponse, conditional_response, revalidate
+from app.models.catalog import CatalogListing
+from app.models.product import Product
+from app.schemas.product import (
+    CategoryOut,
+    ProductBatchIn,
+    ProductBatchOut,
+    ProductFacetsOut,
+    ProductOut,
+    ProductsMeta,
+    ProductsResponse,
+)
+from app.services.bootstrap import categories_body_async
+from app.services.catalog_cache import get_product_count, get_product_facets
+from app.services.catalog_facets import compute_facets
+from app.services.catalog_listing import (
+    excluded_fields,
+    listing_load_only,
+    listing_to_out,
+    parse_fields,
+)
+from app.services.catalog_query import ProductFilters
+from app.services.pagination import Cursor, decode_cursor, encode_cursor, keyset_condition
 from app.services.product_media import products_to_out
-from app.services.catalog_cache import get_categories_payload
+from app.services.response_cache import catalog_responses
 
 
 router = APIRouter()
 
+# Seconds browsers and the proxy may reuse a response before revalidating.
+PRODUCT_MAX_AGE = 30
+CATEGORIES_MAX_AGE = 60
+
+
+def _listing_body(
+    db: Session,
+    filters: ProductFilters,
+    sort: str | None,
+    page: int,
+    page_size: int,
+    cursor: str | None,
+    count: str,
+    fields: frozenset[str] | None,
+) -> tuple[bytes, set[str]]:
+    base_query, rank = filters.apply(db.query(CatalogListing))
+
+    total = get_product_count(
+        filters,
+        count,
+        lambda: base_query.with_entities(
+            func.count(CatalogListing.product_id)).scalar() or 0,
+    )
+
+    key, _, direction = (sort or "created_at:desc").partition(":")
+    if key == "relevance":
+        # Best matches first; without a ranked search fall back to newest.
+        if rank is None:
+            key, direction = "created_at", "desc"
+        elif cursor:
+            raise HTTPException(
+                status_code=400, detail="Cursor pagination is not available for relevance sort")
+        else:
+            direction = direction or "desc"
+    descending = (direction or "asc") == "desc"
+    sort_key = f"{key}:{'desc' if descending else 'asc'}"
+    column = rank if key == "relevance" else getattr(CatalogListing, key)
+
+    position: Cursor | None = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if position.sort != sort_key:
+            raise HTTPException(
+                status_code=400, detail="Cursor does not match sort order")
+
+    # The product id breaks ties so keyset positions are unambiguous.
+    walk_desc = descending != (position.backward if position else False)
+    ordering = (column.desc(), CatalogListing.product_id.desc()) if walk_desc else (
+        column.asc(), CatalogListing.product_id.asc())
+    sorted_query = base_query.order_by(*ordering)
+    # Cursors are built from the sort column, so it is loaded even if not requested.
+    loader = listing_load_only(fields, *(() if key == "relevance" else (key,)))
+    if loader is not None:
+        sorted_query = sorted_query.options(loader)
+
+    # One extra row tells us whether another page exists without a COUNT.
+    if position:
+        sorted_query = sorted_query.filter(
+            keyset_condition(column, CatalogListing.product_id, position, descending))
+        rows = sorted_query.limit(page_size + 1).all()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if position.backward:
+            rows.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, True
+    else:
+        offset = (page - 1) * page_size
+        rows = sorted_query.offset(offset).limit(page_size + 1).all()
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        has_prev = page > 1 and (total is None or total > 0)
+
+    items = [listing_to_out(row, fields) for row in rows]
+
+    total_pages = ceil(total / page_size) if total is not None else None
+
+    def _boundary(row: CatalogListing, backward: bool) -> str | None:
+        if key == "relevance":
+            return None
+        return encode_cursor(Cursor(
+            sort=sort_key, value=getattr(row, key), id=row.product_id, backward=backward))
+
+    response = ProductsResponse.model_construct(
+        items=items,
+        meta=ProductsMeta.model_construct(
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=total_pages,
+            has_next=has_next,
+            has_prev=has_prev,
+        ),
+        next_cursor=_boundary(rows[-1], False) if rows and has_next else None,
+        prev_cursor=_boundary(rows[0], True) if rows and has_prev else None,
+    )
+
+    tags = {"listing"} | {f"product:{row.product_id}" for row in rows}
+    if filters.category:
+        tags.add(f"category:{filters.category}")
+    if filters.in_stock:
+        tags.add("inventory")
+    exclude = excluded_fields(fields)
+    body = response.model_dump_json(
+        exclude={"items": {"__all__": exclude}} if exclude else None)
+    return body.encode(), tags
+
 
 @router.get("/products", response_model=ProductsResponse)
-def list_products(
-    db: Session = Depends(get_db),
+async def list_products(
+    db: AsyncSession = Depends(get_async_db),
     category: int | None = Query(None, ge=1),
     q: str | None = Query(None, min_length=1, max_length=120),
     sort: str | None = Query(
-        None, pattern="^(price|name|created_at)(:(asc|desc))?$"),
+        None, pattern="^(price|name|created_at|relevance)(:(asc|desc))?$"),
     page: int = Query(1, ge=1),
     page_size: int = Query(12, ge=1, le=100),
     price_min: int | None = Query(None, ge=0),
     price_max: int | None = Query(None, ge=0),
     in_stock: bool = False,
+    cursor: str | None = Query(None, max_length=512),
+    count: str = Query("exact", pattern="^(exact|estimate|none)$"),
+    fields: str | None = Query(
+        None, max_length=200, description="Comma-separated ProductOut fields to return"),
 ):
-    if price_min is not None and price_max is not None and price_min > price_max:
-        price_min, price_max = price_max, price_min
-
-    base_query = db.query(Product).filter(Product.active.is_(True))
-
-    if category:
-        base_query = base_query.filter(Product.category_id == category)
-    if q:
-        like = f"%{q}%"
-        base_query = base_query.filter(Product.name.ilike(like))
-    if price_min is not None:
-        base_query = base_query.filter(Product.price >= price_min)
-    if price_max is not None:
-        base_query = base_query.filter(Product.price <= price_max)
-    if in_stock:
-        availability = Inventory.current_stock - Inventory.reserved_stock
-        base_query = base_query.join(Inventory).filter(availability > 0)
-
-    total = base_query.with_entities(func.count(
-        func.distinct(Product.id))).scalar() or 0
-
-    if sort:
-        key, _, direction = sort.partition(":")
-        direction = direction or "asc"
-        column = getattr(Product, key)
-        sorted_query = base_query.order_by(
-            column.desc() if direction == "desc" else column.asc())
-    else:
-        sorted_query = base_query.order_by(Product.created_at.desc())
+    try:
+        selected = parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    filters = ProductFilters.from_params(
+        category=category,
+        q=q,
+        price_min=price_min,
+        price_max=price_max,
+        in_stock=in_stock,
+    )
+    cache_key = ("products", filters, sort, page, page_size, cursor, count, selected)
+
+    async def build() -> tuple[bytes, set[str]]:
+        # The query builder is shared with sync code; run_sync drives it over
+        # the async connection, so no worker thread waits on the database.
+        return await db.run_sync(
+            _listing_body, filters, sort, page, page_size, cursor, count, selected)
+
+    cached = await catalog_responses.fetch_async(cache_key, build)
+    return FastJSONResponse(cached.body)
 
-    offset = (page - 1) * page_size
-    rows = sorted_query.offset(offset).limit(page_size).all()
 
-    items = products_to_out(db, rows)
+@router.get("/products/facets", response_model=ProductFacetsOut)
+def product_facets(
+    db: Session = Depends(get_db),
+    category: int | None = Query(None, ge=1),
+    q: str | None = Query(None, min_length=1, max_length=120),
+    price_min: int | None = Query(None, ge=0),
+    price_max: int | None = Query(None, ge=0),
+    in_stock: bool = False,
+):
+    filters = ProductFilters.from_params(
+        category=category,
+        q=q,
+        price_min=price_min,
+        price_max=price_max,
+        in_stock=in_stock,
+    )
+    return FastJSONResponse(
+        get_product_facets(filters, lambda: compute_facets(db, filters)))
+
+
+# Enough for a full cart or favorites list while keeping the IN list sane.
+MAX_BATCH_IDS = 300
 
-    total_pages = ceil(total / page_size) if page_size else 1
-    has_next = page < total_pages
-    has_prev = page > 1 and total > 0
 
-    return {
-        "items": items,
-        "meta": {
-            "total": total,
-            "page": page,
-            "page_size": page_size,
-            "total_pages": total_pages,
-            "has_next": has_next,
-            "has_prev": has_prev,
-        },
-    }
+def _batch_lookup(db: Session, ids: list[int]) -> ProductBatchOut:
+    # Duplicates are answered once; the first occurrence fixes the position.
+    wanted = list(dict.fromkeys(ids))
+    if len(wanted) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request")
+    products = (
+        db.query(Product)
+        .filter(Product.id.in_(wanted), Product.active.is_(True))
+        .all()
+        if wanted else []
+    )
+    by_id = {item.id: item for item in products_to_out(db, products)}
+    return ProductBatchOut.model_construct(
+        items=[by_id[pid] for pid in wanted if pid in by_id],
+        missing=[pid for pid in wanted if pid not in by_id],
+    )
+
+
+@router.get("/products/batch", response_model=ProductBatchOut)
+def get_products_batch(
+    db: Session = Depends(get_db),
+    ids: str = Query(..., max_length=4000, description="Comma-separated product ids"),
+):
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    return FastJSONResponse(_batch_lookup(db, parsed))
+
+
+@router.post("/products/batch", response_model=ProductBatchOut)
+def post_products_batch(payload: ProductBatchIn, db: Session = Depends(get_db)):
+    return FastJSONResponse(_batch_lookup(db, payload.ids))
 
 
 @router.get("/products/{product_id}", response_model=ProductOut)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    product = db.get(Product, product_id)
-    if not product or not product.active:
-        raise HTTPException(status_code=404, detail="Product not found")
-    return products_to_out(db, [product])[0]
+async def get_product(
+    product_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    fields: str | None = Query(
+        None, max_length=200, description="Comma-separated ProductOut fields to return"),
+):
+    try:
+        selected = parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    async def build() -> tuple[bytes, set[str]]:
+        loader = listing_load_only(selected)
+        row = await db.get(CatalogListing, product_id, options=[loader] if loader else None)
+        if not row:
+            raise HTTPException(status_code=404, detail="Product not found")
+        item = listing_to_out(row, selected)
+        return item.model_dump_json(exclude=excluded_fields(selected)).encode(), {f"product:{product_id}"}
+
+    cached = await catalog_responses.fetch_async(("product", product_id, selected), build)
+    return conditional_response(request, cached, revalidate(PRODUCT_MAX_AGE))
 
 
 @router.get("/categories", response_model=list[CategoryOut])
-def list_categories(db: Session = Depends(get_db)):
-    return get_categories_payload(db)
+async def list_categories(request: Request, db: AsyncSession = Depends(get_async_db)):
+    cached = await categories_body_async(db)
+    return conditional_response(request, cached, revalidate(CATEGORIES_MAX_AGE))
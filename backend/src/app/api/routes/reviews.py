@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.api.deps import get_db, require_roles, get_current_user_id
+from app.api.deps import get_async_db, get_db, require_roles, get_current_user_id
 from app.models.review import Review
 from app.models.product import Product
 from app.schemas.review import ReviewCreate, ReviewOut, ReviewUpdate, ReviewAdminOut
@@ -43,18 +45,20 @@ def create_review(
 
 
 @router.get("/products/{product_id}/reviews", response_model=List[ReviewOut])
-def get_product_reviews(
+async def get_product_reviews(
     product_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
 ):
     # Получаем только одобренные отзывы для публичного API
-    reviews = db.query(Review).filter(
-        Review.product_id == product_id,
-        Review.approved.is_(True)
-    ).offset(skip).limit(limit).all()
-    return reviews
+    result = await db.execute(
+        select(Review)
+        .where(Review.product_id == product_id, Review.approved.is_(True))
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
 
 
 @router.post("/reviews/{review_id}/helpful")
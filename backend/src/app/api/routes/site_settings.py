@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Dict
 
-from app.api.deps import get_db, require_roles
+from app.api.deps import get_async_db, get_db, require_roles
+from app.api.responses import conditional_response, revalidate
 from app.models.site_settings import SiteSetting
 from app.schemas.site_settings import SiteSettingOut, SiteSettingCreate, SiteSettingUpdate, SiteSettingsDict
+from app.services.bootstrap import public_settings_body_async
+from app.services.response_cache import settings_responses
 
 router = APIRouter()
 
+PUBLIC_SETTINGS_MAX_AGE = 60
+
 
 @router.get("/settings", response_model=List[SiteSettingOut])
 def get_all_settings(
@@ -27,13 +33,12 @@ def get_all_settings(
 
 
 @router.get("/settings/public", response_model=SiteSettingsDict)
-def get_public_settings(db: Session = Depends(get_db)):
+async def get_public_settings(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Получить публичные настройки сайта (доступно всем)
     """
-    settings = db.query(SiteSetting).filter(
-        SiteSetting.is_public.is_(True)).all()
-    return {"settings": {s.key: s.value for s in settings if s.value is not None}}
+    cached = await public_settings_body_async(db)
+    return conditional_response(request, cached, revalidate(PUBLIC_SETTINGS_MAX_AGE))
 
 
 @router.get("/settings/{key}", response_model=SiteSettingOut)
@@ -68,6 +73,7 @@ def create_setting(
     db_setting = SiteSetting(**setting.model_dump())
     db.add(db_setting)
     db.commit()
+    settings_responses.purge("settings")
     db.refresh(db_setting)
     return db_setting
 
@@ -90,6 +96,7 @@ def update_setting(
         setattr(db_setting, field, value)
 
     db.commit()
+    settings_responses.purge("settings")
     db.refresh(db_setting)
     return db_setting
 
@@ -108,6 +115,7 @@ def delete_setting(
 
     db.delete(db_setting)
     db.commit()
+    settings_responses.purge("settings")
     return {"success": True}
 
 
@@ -127,4 +135,5 @@ def update_settings_batch(
             db.add(SiteSetting(key=key, value=value))
 
     db.commit()
+    settings_responses.purge("settings")
     return {"settings": settings}
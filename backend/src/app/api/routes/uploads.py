@@ -0,0 +1,31 @@
+import mimetypes
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse, Response
+
+from app.core.config import settings
+from app.services.uploads import cache_control_for, resolve_upload, uploads_root
+
+
+router = APIRouter()
+
+
+@router.api_route("/uploads/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+def serve_upload(path: str):
+    """Resolve an uploaded file and hand the transfer off.
+
+    In ``accel`` mode only headers are returned and nginx streams the file
+    from its internal location; otherwise ``FileResponse`` sends it.
+    """
+
+    file_path = resolve_upload(path)
+    if file_path is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    headers = {"Cache-Control": cache_control_for(file_path)}
+    if settings.UPLOADS_SERVE_MODE == "accel":
+        relative = file_path.relative_to(uploads_root()).as_posix()
+        media_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+        headers["X-Accel-Redirect"] = f"{settings.UPLOADS_ACCEL_PREFIX.rstrip('/')}/{relative}"
+        return Response(media_type=media_type, headers=headers)
+    return FileResponse(file_path, headers=headers)
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import secrets
 
@@ -18,12 +19,44 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
 
     DATABASE_URL: str | None = None
+    # Per engine (sync and async each get a pool of this size).
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
 
     SMS_CODE_LENGTH: int = 6
     SMS_CODE_TTL_SECONDS: int = 300
 
     # Where product folders with images live
     UPLOADS_DIR: str = "/app/uploads_temp"
+    # Serve images from slug-named legacy folders for products without a
+    # gallery. Disable once `python -m app.scripts.migrate_legacy_images` ran.
+    LEGACY_IMAGES_FALLBACK: bool = True
+    # "file" streams uploads from Python (dev); "accel" answers with
+    # X-Accel-Redirect so nginx sends the file from UPLOADS_ACCEL_PREFIX.
+    UPLOADS_SERVE_MODE: Literal["file", "accel"] = "file"
+    UPLOADS_ACCEL_PREFIX: str = "/_uploads/"
+    # Per-file size limit and files per gallery upload request.
+    UPLOAD_MAX_BYTES: int = 15 * 1024 * 1024
+    UPLOAD_MAX_FILES: int = 20
+
+    # Background job worker threads started with the app; 0 disables them
+    # (jobs then wait in the table until a process with workers picks them up).
+    JOB_WORKERS: int = 2
+    JOB_POLL_SECONDS: float = 5.0
+
+    # How long POST /api/cart/hold sets stock aside, and how often expired
+    # holds are released (0 disables the sweeper in this process).
+    CART_HOLD_TTL_SECONDS: int = 900
+    CART_HOLD_SWEEP_SECONDS: float = 30.0
+    # Holds are anonymous: cap units per product, and how long a hold can
+    # be kept alive by renewing it.
+    CART_HOLD_MAX_UNITS: int = 5
+    CART_HOLD_MAX_LIFETIME_SECONDS: int = 1800
+
+    # Idempotency-Key on POST /api/orders: how long a key is remembered, and
+    # how long a duplicate waits for the original request to finish.
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_WAIT_SECONDS: float = 15.0
 
     # Dev settings
     DEV_LOGIN_ENABLED: bool = False
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+BASELINE_REVISION = "0001_baseline"
+# Arbitrary key for pg_advisory_lock so concurrent workers migrate one at a time.
+_PG_MIGRATION_LOCK = 7_412_001
+
+
+def alembic_config() -> Config:
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+# Columns added to ``users`` after its table was first created. Before
+# Alembic they were patched in at startup with PRAGMA checks, which did
+# nothing on Postgres, so pre-Alembic databases may lack any of them.
+def _late_user_columns() -> tuple[sa.Column, ...]:
+    return (
+        sa.Column("password_hash", sa.String(length=255), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("is_blocked", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+
+def _complete_baseline(conn: Connection) -> None:
+    """Add the baseline columns a pre-Alembic database may be missing."""
+
+    present = {column["name"] for column in inspect(conn).get_columns("users")}
+    missing = [column for column in _late_user_columns() if column.name not in present]
+    if missing:
+        op = Operations(MigrationContext.configure(conn))
+        for column in missing:
+            op.add_column("users", column)
+
+
+def upgrade_database(engine: Engine) -> None:
+    """Apply pending migrations.
+
+    Databases created by ``create_all`` before migrations existed have the
+    baseline tables but no ``alembic_version``; they are brought up to the
+    baseline schema and stamped at it first, so only the later revisions run.
+    """
+
+    config = alembic_config()
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.exec_driver_sql(f"SELECT pg_advisory_xact_lock({_PG_MIGRATION_LOCK})")
+        config.attributes["connection"] = conn
+        inspector = inspect(conn)
+        if not inspector.has_table("alembic_version") and inspector.has_table("products"):
+            _complete_baseline(conn)
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
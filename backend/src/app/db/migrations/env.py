@@ -0,0 +1,69 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+
+from app.db.base import Base
+from app.db.session import DATABASE_URL, connect_args
+from app.models import (  # noqa: F401
+    catalog, idempotency, job, order, product, review, role, sequence, site_settings,
+    stock_hold, user,
+)
+
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # Full-text search structures are not mapped: the SQLite FTS5 table is
+    # managed by app.services.product_search, the Postgres column and index
+    # by migration 0011.
+    if type_ == "table" and name and name.startswith("products_fts"):
+        return False
+    if type_ in ("column", "index") and name in ("search_vector", "ix_products_search_vector"):
+        return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=DATABASE_URL.startswith("sqlite"),
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_with(connection)
+        return
+    engine = create_engine(DATABASE_URL, connect_args=connect_args)
+    with engine.connect() as connection:
+        _run_with(connection)
+
+
+def _run_with(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
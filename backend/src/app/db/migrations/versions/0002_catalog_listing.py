@@ -0,0 +1,50 @@
+"""Catalog listing read model
+
+Revision ID: 0002_catalog_listing
+Revises: 0001_baseline
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002_catalog_listing'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Early development databases got this table from create_all.
+    if sa.inspect(op.get_bind()).has_table('catalog_listing'):
+        return
+    op.create_table('catalog_listing',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.String(length=4000), nullable=True),
+    sa.Column('price', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('category_slug', sa.String(length=64), nullable=True),
+    sa.Column('category_path', sa.String(length=512), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('available_stock', sa.Integer(), nullable=True),
+    sa.Column('image', sa.String(length=2000), nullable=True),
+    sa.Column('images', sa.JSON(), nullable=True),
+    sa.Column('gallery', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    op.create_index('ix_catalog_listing_category_created', 'catalog_listing', ['category_id', 'created_at'], unique=False)
+    op.create_index('ix_catalog_listing_category_price', 'catalog_listing', ['category_id', 'price'], unique=False)
+    op.create_index('ix_catalog_listing_created', 'catalog_listing', ['created_at', 'product_id'], unique=False)
+    op.create_index('ix_catalog_listing_name', 'catalog_listing', ['name', 'product_id'], unique=False)
+    op.create_index('ix_catalog_listing_price', 'catalog_listing', ['price', 'product_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_catalog_listing_price', table_name='catalog_listing')
+    op.drop_index('ix_catalog_listing_name', table_name='catalog_listing')
+    op.drop_index('ix_catalog_listing_created', table_name='catalog_listing')
+    op.drop_index('ix_catalog_listing_category_price', table_name='catalog_listing')
+    op.drop_index('ix_catalog_listing_category_created', table_name='catalog_listing')
+    op.drop_table('catalog_listing')
@@ -0,0 +1,37 @@
+"""Indexes for hot read paths
+
+Catalog listing filters/sorts, gallery loading, approved reviews per
+product, and order lookups by customer contact and date.
+
+Revision ID: 0003_performance_indexes
+Revises: 0002_catalog_listing
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003_performance_indexes'
+down_revision = '0002_catalog_listing'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_products_active_category_price', 'products', ['active', 'category_id', 'price'], unique=False)
+    op.create_index('ix_products_active_created', 'products', ['active', 'created_at'], unique=False)
+    op.create_index('ix_product_images_product_sort', 'product_images', ['product_id', 'sort'], unique=False)
+    op.create_index('ix_reviews_product_approved_created', 'reviews', ['product_id', 'approved', 'created_at'], unique=False)
+    op.create_index(op.f('ix_orders_customer_phone'), 'orders', ['customer_phone'], unique=False)
+    op.create_index(op.f('ix_orders_customer_email'), 'orders', ['customer_email'], unique=False)
+    op.create_index(op.f('ix_orders_created_at'), 'orders', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_orders_created_at'), table_name='orders')
+    op.drop_index(op.f('ix_orders_customer_email'), table_name='orders')
+    op.drop_index(op.f('ix_orders_customer_phone'), table_name='orders')
+    op.drop_index('ix_reviews_product_approved_created', table_name='reviews')
+    op.drop_index('ix_product_images_product_sort', table_name='product_images')
+    op.drop_index('ix_products_active_created', table_name='products')
+    op.drop_index('ix_products_active_category_price', table_name='products')
@@ -0,0 +1,28 @@
+"""Image dimensions and derivative variants on product_images
+
+Revision ID: 0004_image_variants
+Revises: 0003_performance_indexes
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004_image_variants'
+down_revision = '0003_performance_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('product_images') as batch_op:
+        batch_op.add_column(sa.Column('width', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('height', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('product_images') as batch_op:
+        batch_op.drop_column('variants')
+        batch_op.drop_column('height')
+        batch_op.drop_column('width')
@@ -0,0 +1,36 @@
+"""Stock holds table
+
+Revision ID: 0006_stock_holds
+Revises: 0005_jobs
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0006_stock_holds'
+down_revision = '0005_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stock_holds',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('token', sa.String(length=64), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_stock_holds_token'), 'stock_holds', ['token'], unique=False)
+    op.create_index(op.f('ix_stock_holds_expires_at'), 'stock_holds', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_stock_holds_expires_at'), table_name='stock_holds')
+    op.drop_index(op.f('ix_stock_holds_token'), table_name='stock_holds')
+    op.drop_table('stock_holds')
@@ -0,0 +1,37 @@
+"""Idempotency keys table
+
+Revision ID: 0007_idempotency_keys
+Revises: 0006_stock_holds
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0007_idempotency_keys'
+down_revision = '0006_stock_holds'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('scope', sa.String(length=64), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('request_hash', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('response', sa.JSON(), nullable=True),
+        sa.Column('locked_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('scope', 'key', name='uq_idempotency_keys_scope_key'),
+    )
+    op.create_index(op.f('ix_idempotency_keys_created_at'), 'idempotency_keys',
+                    ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_idempotency_keys_created_at'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
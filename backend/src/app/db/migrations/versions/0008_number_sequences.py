@@ -0,0 +1,32 @@
+"""Number sequences table, seeded for order numbers
+
+Revision ID: 0008_number_sequences
+Revises: 0007_idempotency_keys
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0008_number_sequences'
+down_revision = '0007_idempotency_keys'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'number_sequences',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    # Existing numbers are ORD-<order id>; continue after the highest one.
+    op.execute(
+        "INSERT INTO number_sequences (name, value) "
+        "SELECT 'order_number', COALESCE(MAX(id), 0) FROM orders"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('number_sequences')
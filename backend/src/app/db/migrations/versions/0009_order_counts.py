@@ -0,0 +1,33 @@
+"""Per-status order counters and status/date index for the admin listing
+
+Revision ID: 0009_order_counts
+Revises: 0008_number_sequences
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0009_order_counts'
+down_revision = '0008_number_sequences'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'order_counts',
+        sa.Column('status', sa.String(length=32), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('status'),
+    )
+    op.execute(
+        "INSERT INTO order_counts (status, count) "
+        "SELECT status, COUNT(*) FROM orders GROUP BY status"
+    )
+    op.create_index('ix_orders_status_created_at', 'orders', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_status_created_at', table_name='orders')
+    op.drop_table('order_counts')
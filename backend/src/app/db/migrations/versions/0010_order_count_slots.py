@@ -0,0 +1,45 @@
+"""Split the per-status order counters over slot rows
+
+Revision ID: 0010_order_count_slots
+Revises: 0009_order_counts
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0010_order_count_slots'
+down_revision = '0009_order_counts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'order_counts_new',
+        sa.Column('status', sa.String(length=32), nullable=False),
+        sa.Column('slot', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('status', 'slot'),
+    )
+    op.execute(
+        "INSERT INTO order_counts_new (status, slot, count) "
+        "SELECT status, 0, count FROM order_counts"
+    )
+    op.drop_table('order_counts')
+    op.rename_table('order_counts_new', 'order_counts')
+
+
+def downgrade() -> None:
+    op.create_table(
+        'order_counts_old',
+        sa.Column('status', sa.String(length=32), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('status'),
+    )
+    op.execute(
+        "INSERT INTO order_counts_old (status, count) "
+        "SELECT status, SUM(count) FROM order_counts GROUP BY status"
+    )
+    op.drop_table('order_counts')
+    op.rename_table('order_counts_old', 'order_counts')
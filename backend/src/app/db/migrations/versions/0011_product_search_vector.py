@@ -0,0 +1,44 @@
+"""Full-text search column and GIN index for products (Postgres only)
+
+The ``search_vector`` column is generated from name and description with
+the ``russian`` text search configuration (``PG_TS_CONFIG`` in
+``app.services.product_search``). It is not mapped on ``Product``. SQLite
+builds its FTS5 index at startup instead, since FTS5 is optional there.
+
+Revision ID: 0011_product_search_vector
+Revises: 0010_order_count_slots
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+
+
+revision = '0011_product_search_vector'
+down_revision = '0010_order_count_slots'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Databases that already got these from the old startup DDL keep them.
+    op.execute(
+        """
+        ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('russian', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('russian', coalesce(description, '')), 'B')
+        ) STORED
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_products_search_vector "
+        "ON products USING GIN (search_vector)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_products_search_vector")
+    op.execute("ALTER TABLE products DROP COLUMN IF EXISTS search_vector")
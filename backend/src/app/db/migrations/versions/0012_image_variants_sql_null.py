@@ -0,0 +1,29 @@
+"""Store pending image variants as SQL NULL instead of JSON 'null'
+
+Uploads left ``product_images.variants`` as the JSON literal ``null`` until
+their variants job ran, which ``IS NULL`` does not match. The column now
+maps None to SQL NULL; convert the rows written before that.
+
+Revision ID: 0012_image_variants_sql_null
+Revises: 0011_product_search_vector
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+
+
+revision = '0012_image_variants_sql_null'
+down_revision = '0011_product_search_vector'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "UPDATE product_images SET variants = NULL "
+        "WHERE CAST(variants AS TEXT) = 'null'"
+    )
+
+
+def downgrade() -> None:
+    # SQL NULL is what the column held before uploads wrote JSON 'null'.
+    pass
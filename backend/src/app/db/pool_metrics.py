@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from threading import Lock
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+_POOL_STATS: dict[str, int] = {
+    "checkouts": 0,
+    "in_use": 0,
+    "peak_in_use": 0,
+    "requests": 0,
+    "requests_using_db": 0,
+}
+_STATS_LOCK = Lock()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    with _STATS_LOCK:
+        _POOL_STATS["checkouts"] += 1
+        _POOL_STATS["in_use"] += 1
+        _POOL_STATS["peak_in_use"] = max(_POOL_STATS["peak_in_use"], _POOL_STATS["in_use"])
+
+
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    with _STATS_LOCK:
+        _POOL_STATS["in_use"] = max(0, _POOL_STATS["in_use"] - 1)
+
+
+def install_pool_metrics(engine: Engine) -> None:
+    """Count connection checkouts and check-ins on ``engine``'s pool."""
+
+    if not event.contains(engine, "checkout", _on_checkout):
+        event.listen(engine, "checkout", _on_checkout)
+        event.listen(engine, "checkin", _on_checkin)
+
+
+def _on_begin(session, transaction, connection) -> None:
+    session.info["used_connection"] = True
+
+
+def track_session_use(session_class: type) -> None:
+    """Flag sessions of ``session_class`` in ``info["used_connection"]``
+    on their first connection checkout, for ``record_request``."""
+
+    if not event.contains(session_class, "after_begin", _on_begin):
+        event.listen(session_class, "after_begin", _on_begin)
+
+
+def record_request(used_connection: bool) -> None:
+    """Called once per request that depended on ``get_db`` or ``get_async_db``.
+
+    Both engines' checkouts are counted, so requests served by either must
+    be too or ``checkouts_per_request`` is skewed. ``used_connection`` is
+    whether the request's session checked a connection out at all, the same
+    event for both stacks.
+    """
+
+    with _STATS_LOCK:
+        _POOL_STATS["requests"] += 1
+        if used_connection:
+            _POOL_STATS["requests_using_db"] += 1
+
+
+def pool_snapshot(engine: Engine) -> dict[str, float | int | str]:
+    """Current pool utilisation plus the counters collected since start-up."""
+
+    with _STATS_LOCK:
+        stats = dict(_POOL_STATS)
+    pool = engine.pool
+    requests = stats["requests"]
+    size = pool.size() if hasattr(pool, "size") else None
+    stats.update(
+        pool=type(pool).__name__,
+        pool_size=size,
+        overflow=pool.overflow() if hasattr(pool, "overflow") else None,
+        checked_out=pool.checkedout() if hasattr(pool, "checkedout") else stats["in_use"],
+        checkouts_per_request=round(stats["checkouts"] / requests, 3) if requests else 0.0,
+        db_use_per_request=round(stats["requests_using_db"] / requests, 3) if requests else 0.0,
+    )
+    return stats
+
+
+def reset_pool_metrics() -> None:
+    with _STATS_LOCK:
+        in_use = _POOL_STATS["in_use"]
+        for key in _POOL_STATS:
+            _POOL_STATS[key] = 0
+        _POOL_STATS["in_use"] = in_use
+        _POOL_STATS["peak_in_use"] = in_use
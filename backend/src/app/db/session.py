@@ -1,6 +1,11 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import Any, Callable
+
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.db.pool_metrics import install_pool_metrics, track_session_use
 
 
 def _make_db_url() -> str:
@@ -9,11 +14,105 @@ def _make_db_url() -> str:
     return "sqlite:///./app.db"
 
 
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def _make_async_db_url(url: str) -> str:
+    """The same database addressed through its asyncio driver."""
+
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
 DATABASE_URL = _make_db_url()
+ASYNC_DATABASE_URL = _make_async_db_url(DATABASE_URL)
+
+def _uses_queue_pool(url: str) -> bool:
+    # In-memory SQLite lives in a single connection (SingletonThreadPool /
+    # StaticPool), which takes no pool sizing.
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return True
+    return parsed.database not in (None, "", ":memory:") and parsed.query.get("mode") != "memory"
+
 
 connect_args = {"check_same_thread": False} if DATABASE_URL.startswith(
     "sqlite") else {}
+_pool_args = (
+    {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW}
+    if _uses_queue_pool(DATABASE_URL) else {}
+)
+
+
+class AppSession(Session):
+    """Session class of both stacks (directly, and behind each AsyncSession).
+
+    Flags the first connection checkout in ``info`` for the request metrics
+    (see ``app.api.deps``).
+    """
+
+
+track_session_use(AppSession)
+
 engine = create_engine(DATABASE_URL, echo=False, future=True,
-                       pool_pre_ping=True, connect_args=connect_args)
+                       pool_pre_ping=True, connect_args=connect_args, **_pool_args)
+install_pool_metrics(engine)
 SessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine, future=True)
+    class_=AppSession, autocommit=False, autoflush=False, bind=engine, future=True)
+
+# Hot read routes use the async stack so waiting on the database does not
+# occupy one of Starlette's threadpool threads.
+# aiosqlite defaults to NullPool for files, which would open a connection
+# (and its worker thread) per request; pool it like the sync engine instead.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, echo=False, pool_pre_ping=True,
+    **({"poolclass": AsyncAdaptedQueuePool, **_pool_args} if _pool_args else {}))
+install_pool_metrics(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, sync_session_class=AppSession,
+    autoflush=False, expire_on_commit=False)
+
+
+class LazySession:
+    """Session stand-in that creates the real ``Session`` on first use.
+
+    Handlers that never touch the database (static content, cache hits) then
+    cost neither a session nor a pool checkout. Attribute access is forwarded,
+    so it can be used anywhere a ``Session`` is expected.
+    """
+
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory: Callable[[], Session] = SessionLocal):
+        self._factory = factory
+        self._session: Session | None = None
+
+    @property
+    def opened(self) -> bool:
+        return self._session is not None
+
+    @property
+    def used_connection(self) -> bool:
+        return self._session is not None and self._session.info.get("used_connection", False)
+
+    def _get(self) -> Session:
+        if self._session is None:
+            self._session = self._factory()
+        return self._session
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get(), name)
+
+    def __contains__(self, instance: object) -> bool:
+        return self._session is not None and instance in self._session
+
+    def __iter__(self):
+        return iter(self._get())
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
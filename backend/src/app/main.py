@@ -1,7 +1,6 @@
 ﻿from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from app.api.routes.auth import router as auth_router
 from app.api.routes.products import router as products_router
@@ -9,34 +8,35 @@ from app.api.routes.admin import router as admin_router
 from app.api.routes.reviews import router as reviews_router
 from app.api.routes.site_settings import router as site_settings_router
 from app.api.routes.orders import router as orders_router
+from app.api.routes.cart import router as cart_router
 from app.api.routes.content import router as content_router
+from app.api.routes.bootstrap import router as bootstrap_router
+from app.api.routes.uploads import router as uploads_router
 from app.core.config import settings
 from app.data.demo_catalog import CATEGORIES, PRODUCTS
-from app.db.base import Base
-from app.db.session import SessionLocal, engine
-from sqlalchemy import text
+from app.db.migrate import upgrade_database
+from app.db.session import SessionLocal, async_engine, engine
 from app.middleware.rate_limit import rate_limit_middleware
+from app.middleware.upload_limit import upload_size_middleware
+from app.models.catalog import CatalogListing
 from app.models.product import Category, Inventory, Product, ProductImage
 from app.models.site_settings import SiteSetting
 from app.models.user import User
 from app.models.role import Role
+from app.services.cart_holds import HoldSweeper
+from app.services.catalog_listing import rebuild_listing
+from app.services.jobs import JobWorkerPool
+from app.services.product_search import ensure_search_index
+import app.services.job_handlers  # noqa: F401  (registers job kinds)
+
+job_workers = JobWorkerPool(settings.JOB_WORKERS, settings.JOB_POLL_SECONDS)
+hold_sweeper = HoldSweeper(settings.CART_HOLD_SWEEP_SECONDS)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup logic
-    Base.metadata.create_all(bind=engine)
-    # Lightweight column migration for users table (SQLite-friendly)
-    with engine.connect() as conn:
-        try:
-            cols = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info('users')").fetchall()}
-            if 'password_hash' not in cols:
-                conn.exec_driver_sql("ALTER TABLE users ADD COLUMN password_hash VARCHAR(255)")
-            if 'is_verified' not in cols:
-                conn.exec_driver_sql("ALTER TABLE users ADD COLUMN is_verified BOOLEAN DEFAULT 0")
-            if 'is_blocked' not in cols:
-                conn.exec_driver_sql("ALTER TABLE users ADD COLUMN is_blocked BOOLEAN DEFAULT 0")
-        except Exception:
-            pass
+    upgrade_database(engine)
+    ensure_search_index(engine)
     db = SessionLocal()
     try:
         if db.query(SiteSetting).count() == 0:
@@ -104,14 +104,28 @@ async def lifespan(app: FastAPI):
                     reserved_stock=item.get("reserved", 0),
                 ))
             db.commit()
+
+        # Populate the catalog read model on first start (or after the table
+        # was dropped); afterwards it is maintained by the write paths.
+        if db.query(CatalogListing).count() == 0 and db.query(Product).count() > 0:
+            rebuild_listing(db)
+            db.commit()
+        if settings.JOB_WORKERS > 0:
+            job_workers.start()
+        if settings.CART_HOLD_SWEEP_SECONDS > 0:
+            hold_sweeper.start()
         yield
     finally:
+        hold_sweeper.stop()
+        job_workers.stop()
         db.close()
+        await async_engine.dispose()
 
 app = FastAPI(lifespan=lifespan, title="Dronshop API", version="0.1.0")
 
 # Add rate limiting middleware
 app.middleware("http")(rate_limit_middleware)
+app.middleware("http")(upload_size_middleware)
 
 origins = [o.strip() for o in settings.ALLOWED_ORIGINS.split(",") if o.strip()]
 app.add_middleware(
@@ -125,10 +139,12 @@ app.add_middleware(
 app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
 app.include_router(products_router, prefix="/api", tags=["products"])
 app.include_router(orders_router, prefix="/api", tags=["orders"])
+app.include_router(cart_router, prefix="/api", tags=["orders"])
 app.include_router(admin_router, prefix="/api/admin", tags=["admin"])
 app.include_router(reviews_router, prefix="/api", tags=["reviews"])
 app.include_router(site_settings_router, prefix="/api", tags=["settings"])
 app.include_router(content_router, prefix="/api", tags=["content"])
+app.include_router(bootstrap_router, prefix="/api", tags=["content"])
 
 @app.get("/api/health")
 def health():
@@ -136,6 +152,5 @@ def health():
 
 
 
-
-# Serve static files from uploads directory
-app.mount("/uploads", StaticFiles(directory="/app/uploads_temp"), name="uploads")
+# Uploaded files; nginx does the actual transfer in UPLOADS_SERVE_MODE=accel.
+app.include_router(uploads_router)
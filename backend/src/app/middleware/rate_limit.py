@@ -1,4 +1,5 @@
 from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
 import time
 from typing import Dict, Tuple
 import logging
@@ -90,10 +91,13 @@ if settings.DEV_LOGIN_ENABLED or settings.DEV_SEED:
     # More permissive in dev
     auth_rate_limiter = RateLimiter(max_requests=100, time_window=60)
     strict_rate_limiter = RateLimiter(max_requests=200, time_window=60)
+    cart_rate_limiter = RateLimiter(max_requests=60, time_window=60)
 else:
     # Production-leaning defaults
     auth_rate_limiter = RateLimiter(max_requests=10, time_window=60)
     strict_rate_limiter = RateLimiter(max_requests=20, time_window=60)
+    # Stock holds reserve inventory for everyone else; keep them rare.
+    cart_rate_limiter = RateLimiter(max_requests=10, time_window=60)
 
 
 async def rate_limit_middleware(request: Request, call_next):
@@ -103,11 +107,15 @@ async def rate_limit_middleware(request: Request, call_next):
             await auth_rate_limiter(request)
         elif request.url.path.startswith("/api/admin"):
             await strict_rate_limiter(request)
+        elif request.url.path.startswith("/api/cart"):
+            await cart_rate_limiter(request)
         else:
             await global_rate_limiter(request)
-    except HTTPException:
-        # Re-raise rate limit exceptions
-        raise
+    except HTTPException as exc:
+        # Exceptions raised in middleware bypass FastAPI's handlers, so
+        # answer the 429 here.
+        return JSONResponse(
+            status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers)
     except Exception as e:
         # Log other errors but don't block the request
         logger.error(f"Rate limiting error: {str(e)}")
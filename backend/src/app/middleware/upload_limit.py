@@ -0,0 +1,42 @@
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+# Room for the multipart boundaries and part headers around the files.
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+def _upload_files_allowed(path: str) -> int:
+    """How many files the upload endpoint at ``path`` takes; 0 if it is none."""
+    if not path.startswith("/api/admin/products/"):
+        return 0
+    if path.endswith("/upload-images"):
+        return settings.UPLOAD_MAX_FILES
+    if path.endswith("/upload-image"):
+        return 1
+    return 0
+
+
+async def upload_size_middleware(request: Request, call_next):
+    """Refuse oversized uploads before any of the body is read.
+
+    FastAPI parses (and spools to disk) the whole multipart body before the
+    route runs, so the per-file ``UPLOAD_MAX_BYTES`` check in the route comes
+    too late to protect the server. Here the declared ``Content-Length`` is
+    checked against what the endpoint can legitimately receive; uploads
+    without one (chunked bodies) are refused as well.
+    """
+    files = _upload_files_allowed(request.url.path)
+    if request.method == "POST" and files:
+        limit = files * settings.UPLOAD_MAX_BYTES + _MULTIPART_OVERHEAD
+        declared = request.headers.get("content-length")
+        if declared is None or not declared.isdigit():
+            return JSONResponse(status_code=411, content={"detail": "Content-Length required"})
+        if int(declared) > limit:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"Request is larger than {limit} bytes"},
+                headers={"Connection": "close"},
+            )
+    return await call_next(request)
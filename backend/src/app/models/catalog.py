@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class CatalogListing(Base):
+    """Denormalised read model: one row per active product.
+
+    Maintained by ``app.services.catalog_listing`` in the same transaction as
+    the writes it mirrors, so catalog reads need a single indexed query.
+    """
+
+    __tablename__ = "catalog_listing"
+    __table_args__ = (
+        Index("ix_catalog_listing_created", "created_at", "product_id"),
+        Index("ix_catalog_listing_price", "price", "product_id"),
+        Index("ix_catalog_listing_name", "name", "product_id"),
+        Index("ix_catalog_listing_category_created", "category_id", "created_at"),
+        Index("ix_catalog_listing_category_price", "category_id", "price"),
+    )
+
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    name: Mapped[str] = mapped_column(String(255))
+    description: Mapped[str | None] = mapped_column(String(4000), nullable=True)
+    price: Mapped[int] = mapped_column(Integer)
+    category_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    category_slug: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Slash-joined slugs from the root category down, e.g. "fpv/frames".
+    category_path: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True)
+    # NULL when the product has no inventory record (stock is not tracked).
+    available_stock: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    image: Mapped[str | None] = mapped_column(String(2000), nullable=True)
+    images: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
+    gallery: Mapped[list[dict] | None] = mapped_column(JSON, nullable=True)
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """Client-supplied ``Idempotency-Key`` and the response it produced.
+
+    See ``app.services.idempotency``; rows are pruned after
+    ``IDEMPOTENCY_KEY_TTL_HOURS``.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # Endpoint and caller the key belongs to, e.g. "orders:user:7".
+    scope: Mapped[str] = mapped_column(String(64))
+    key: Mapped[str] = mapped_column(String(255))
+    request_hash: Mapped[str] = mapped_column(String(64))
+    # in_progress -> done; the row is deleted if the request fails
+    status: Mapped[str] = mapped_column(String(16), default="in_progress")
+    response: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    locked_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True)
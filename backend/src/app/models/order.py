@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -8,6 +8,9 @@ from app.db.base import Base
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_status_created_at", "status", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     order_number: Mapped[str] = mapped_column(
@@ -17,8 +20,8 @@ class Order(Base):
 
     customer_first_name: Mapped[str] = mapped_column(String(100))
     customer_last_name: Mapped[str] = mapped_column(String(100))
-    customer_email: Mapped[str] = mapped_column(String(320))
-    customer_phone: Mapped[str] = mapped_column(String(32))
+    customer_email: Mapped[str] = mapped_column(String(320), index=True)
+    customer_phone: Mapped[str] = mapped_column(String(32), index=True)
 
     shipping_method: Mapped[str] = mapped_column(String(50))
     shipping_address: Mapped[str | None] = mapped_column(
@@ -33,7 +36,7 @@ class Order(Base):
     payment_method: Mapped[str] = mapped_column(String(50))
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False)
+        DateTime, default=datetime.utcnow, nullable=False, index=True)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
@@ -54,3 +57,19 @@ class OrderItem(Base):
     total_price: Mapped[int] = mapped_column(Integer)
 
     order: Mapped[Order] = relationship("Order", back_populates="items")
+
+
+class OrderCount(Base):
+    """Number of orders per status, kept up to date by the order write paths
+    (see ``app.services.order_stats``) so listings never run ``COUNT(*)``.
+
+    Each status is split over several ``slot`` rows that writers pick at
+    random, so concurrent checkouts rarely wait on the same row lock; the
+    count of a status is the sum of its slots.
+    """
+
+    __tablename__ = "order_counts"
+
+    status: Mapped[str] = mapped_column(String(32), primary_key=True)
+    slot: Mapped[int] = mapped_column(Integer, primary_key=True, default=0)
+    count: Mapped[int] = mapped_column(Integer, default=0)
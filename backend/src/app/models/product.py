@@ -1,4 +1,4 @@
-from sqlalchemy import String, ForeignKey, Integer, Boolean, DateTime
+from sqlalchemy import JSON, String, ForeignKey, Integer, Boolean, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
 from app.db.base import Base
@@ -15,6 +15,10 @@ class Category(Base):
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_active_category_price", "active", "category_id", "price"),
+        Index("ix_products_active_created", "active", "created_at"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), index=True)
     description: Mapped[str | None] = mapped_column(String(4000))
@@ -28,10 +32,19 @@ class Product(Base):
 
 class ProductImage(Base):
     __tablename__ = "product_images"
+    __table_args__ = (
+        Index("ix_product_images_product_sort", "product_id", "sort"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id"))
     url: Mapped[str] = mapped_column(String(2000))
     sort: Mapped[int] = mapped_column(Integer, default=0)
+    # Pixel size of the original and its resized copies, see
+    # app.services.image_variants. NULL until derivatives are generated;
+    # none_as_null stores a Python None as SQL NULL, not the JSON 'null'.
+    width: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    height: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    variants: Mapped[list[dict] | None] = mapped_column(JSON(none_as_null=True), nullable=True)
 
 
 class Inventory(Base):
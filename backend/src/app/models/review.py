@@ -1,4 +1,4 @@
-﻿from sqlalchemy import String, ForeignKey, Integer, DateTime, Text
+﻿from sqlalchemy import String, ForeignKey, Integer, DateTime, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime, timezone
 from app.db.base import Base
@@ -6,6 +6,10 @@ from app.db.base import Base
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_product_approved_created",
+              "product_id", "approved", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id"))
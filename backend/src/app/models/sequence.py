@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class NumberSequence(Base):
+    """Portable counter behind ``app.services.sequences``; ``value`` is the
+    last number handed out to any process."""
+
+    __tablename__ = "number_sequences"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, default=0)
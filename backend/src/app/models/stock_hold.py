@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class StockHold(Base):
+    """Units set aside for a customer at checkout, counted in
+    ``Inventory.reserved_stock`` until sold or expired.
+
+    One row per product; rows placed together share a ``token``.
+    ``created_at`` is when the hold was first placed and survives renewals.
+    """
+
+    __tablename__ = "stock_holds"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    token: Mapped[str] = mapped_column(String(64), index=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"))
+    quantity: Mapped[int] = mapped_column(Integer)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
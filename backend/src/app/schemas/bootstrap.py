@@ -0,0 +1,15 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.schemas.product import CategoryOut
+from app.schemas.site_settings import SiteSettingsDict
+
+
+class BootstrapOut(BaseModel):
+    # Changes whenever any part changes; also served as the ETag.
+    version: str
+    settings: SiteSettingsDict
+    categories: list[CategoryOut]
+    hero: list[dict[str, Any]]
+    promo: list[dict[str, Any]]
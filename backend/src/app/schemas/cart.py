@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class CartHoldItem(BaseModel):
+    productId: int
+    quantity: int = Field(gt=0)
+
+
+class CartHoldIn(BaseModel):
+    items: list[CartHoldItem] = Field(min_length=1, max_length=100)
+    # Token of the customer's current hold, which this one replaces.
+    holdToken: str | None = None
+
+
+class CartHoldOut(BaseModel):
+    holdToken: str
+    expiresAt: datetime
+    items: list[CartHoldItem]
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    payload: dict[str, Any]
+    status: str
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    locked_at: datetime | None = None
+    last_error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
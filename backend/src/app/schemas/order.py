@@ -33,6 +33,8 @@ class OrderCreate(BaseModel):
     payment: OrderPayment
     items: list[OrderItemIn]
     totalAmount: int
+    # From POST /api/cart/hold; the held stock is converted into the sale.
+    holdToken: str | None = None
 
 
 class OrderItemOut(BaseModel):
@@ -65,3 +67,17 @@ class OrderSummaryOut(BaseModel):
     totalAmount: int
     createdAt: datetime
     itemsCount: int
+
+
+class OrdersMeta(BaseModel):
+    # From the per-status counters; None when date or customer filters
+    # are applied, since those are not counted.
+    total: int | None
+    limit: int
+    has_next: bool
+
+
+class OrdersPage(BaseModel):
+    items: list[OrderSummaryOut]
+    meta: OrdersMeta
+    next_cursor: str | None = None
@@ -1,10 +1,21 @@
 from pydantic import BaseModel
 
 
+class ImageVariantOut(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str  # "webp", "jpeg" or "png"
+
+
 class ProductImageOut(BaseModel):
     id: int
     url: str
     sort: int
+    width: int | None = None
+    height: int | None = None
+    # Resized copies, smallest first; build <img srcset> / <picture> from these.
+    variants: list[ImageVariantOut] | None = None
 
 
 class ProductOut(BaseModel):
@@ -73,10 +84,10 @@ class CategoryUpdate(BaseModel):
 
 
 class ProductsMeta(BaseModel):
-    total: int
+    total: int | None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: int | None
     has_next: bool
     has_prev: bool
 
@@ -84,3 +95,38 @@ class ProductsMeta(BaseModel):
 class ProductsResponse(BaseModel):
     items: list[ProductOut]
     meta: ProductsMeta
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+class CategoryFacet(BaseModel):
+    id: int | None
+    count: int
+
+
+class PriceBucket(BaseModel):
+    min: int
+    max: int | None
+    count: int
+
+
+class PriceFacet(BaseModel):
+    min: int | None
+    max: int | None
+    buckets: list[PriceBucket]
+
+
+class ProductFacetsOut(BaseModel):
+    total: int
+    in_stock: int
+    categories: list[CategoryFacet]
+    price: PriceFacet
+
+
+class ProductBatchIn(BaseModel):
+    ids: list[int]
+
+
+class ProductBatchOut(BaseModel):
+    items: list[ProductOut]
+    missing: list[int]
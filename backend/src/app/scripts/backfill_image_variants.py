@@ -0,0 +1,71 @@
+"""
+Generate resized WebP/fallback derivatives for existing product images.
+
+New uploads get their variants from a ``generate_image_variants`` job; this
+command fills in ``ProductImage.width``, ``height`` and ``variants`` for
+older rows and for images whose job failed for good. Images whose file is
+missing or unreadable are reported and skipped.
+
+Usage::
+
+    python -m app.scripts.backfill_image_variants [--force] [--batch-size 50]
+"""
+
+import argparse
+
+from app.db.session import SessionLocal
+from app.models.product import ProductImage
+from app.services.catalog_listing import refresh_listing
+from app.services.image_variants import generate_variants
+from app.services.response_cache import catalog_responses
+from app.services.uploads import resolve_upload, url_to_relative
+
+
+def backfill(force: bool = False, batch_size: int = 50) -> tuple[int, int]:
+    db = SessionLocal()
+    done = skipped = 0
+    last_id = 0
+    try:
+        while True:
+            query = db.query(ProductImage).filter(ProductImage.id > last_id)
+            if not force:
+                query = query.filter(ProductImage.variants.is_(None))
+            batch = query.order_by(ProductImage.id.asc()).limit(batch_size).all()
+            if not batch:
+                break
+            touched: set[int] = set()
+            for image in batch:
+                relative = url_to_relative(image.url)
+                if relative is None or resolve_upload(relative) is None:
+                    print(f"{image.id}: missing file {image.url}")
+                    skipped += 1
+                    continue
+                try:
+                    image.width, image.height, image.variants = generate_variants(relative)
+                except ValueError as exc:
+                    print(f"{image.id}: {exc}")
+                    skipped += 1
+                    continue
+                touched.add(image.product_id)
+                done += 1
+            refresh_listing(db, touched)
+            db.commit()
+            catalog_responses.purge(*(f"product:{pid}" for pid in touched))
+            last_id = batch[-1].id
+        return done, skipped
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate variants that already exist")
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+    done, skipped = backfill(force=args.force, batch_size=args.batch_size)
+    print(f"Generated variants for {done} image(s), skipped {skipped}")
+
+
+if __name__ == "__main__":
+    main()
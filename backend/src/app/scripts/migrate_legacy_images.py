@@ -0,0 +1,61 @@
+"""
+Copy legacy slug-folder images into ProductImage rows.
+
+Products without a gallery fall back to images found in
+``UPLOADS_DIR/<slugified name>/``. This command records those files as
+``ProductImage`` rows (the files stay where they are), after which the
+fallback can be switched off with ``LEGACY_IMAGES_FALLBACK=false``.
+
+Usage::
+
+    python -m app.scripts.migrate_legacy_images [--dry-run]
+"""
+
+import argparse
+
+from app.db.session import SessionLocal
+from app.models.product import Product, ProductImage
+from app.services.catalog_listing import refresh_listing
+from app.services.product_media import invalidate_uploads_index, legacy_image_urls
+
+
+def migrate(dry_run: bool = False) -> int:
+    invalidate_uploads_index()
+    db = SessionLocal()
+    try:
+        with_gallery = {
+            row[0] for row in db.query(ProductImage.product_id).distinct().all()
+        }
+        migrated_ids: list[int] = []
+        for product in db.query(Product).order_by(Product.id.asc()).all():
+            if product.id in with_gallery:
+                continue
+            urls = legacy_image_urls(product.name)
+            if not urls:
+                continue
+            print(f"{product.id}: {product.name} -> {len(urls)} image(s)")
+            for sort, url in enumerate(urls, start=1):
+                db.add(ProductImage(product_id=product.id, url=url, sort=sort))
+            migrated_ids.append(product.id)
+        if dry_run:
+            db.rollback()
+        else:
+            refresh_listing(db, migrated_ids)
+            db.commit()
+        return len(migrated_ids)
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report what would be migrated without writing")
+    args = parser.parse_args()
+    migrated = migrate(dry_run=args.dry_run)
+    suffix = " (dry run)" if args.dry_run else ""
+    print(f"Migrated {migrated} product(s){suffix}")
+
+
+if __name__ == "__main__":
+    main()
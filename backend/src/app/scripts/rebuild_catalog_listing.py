@@ -0,0 +1,27 @@
+"""
+Regenerate the catalog_listing read model from the source tables.
+
+The read model is kept in sync by the admin and checkout write paths; run
+this after bulk imports, manual SQL edits or a schema change.
+
+Usage::
+
+    python -m app.scripts.rebuild_catalog_listing
+"""
+
+from app.db.session import SessionLocal
+from app.services.catalog_listing import rebuild_listing
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        written = rebuild_listing(db)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Rebuilt catalog_listing: {written} product(s)")
+
+
+if __name__ == "__main__":
+    main()
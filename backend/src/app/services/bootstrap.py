@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from hashlib import blake2b
+from threading import Lock
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.data.content_blocks import HERO_SLIDES, PROMO_BLOCKS
+from app.models.site_settings import SiteSetting
+from app.schemas.product import CategoryOut
+from app.schemas.site_settings import SiteSettingsDict
+from app.services.catalog_cache import get_categories_payload
+from app.services.response_cache import CachedBody, catalog_responses, settings_responses
+
+
+_categories_adapter = TypeAdapter(list[CategoryOut])
+
+# Static blocks are encoded once; their ETags only change on deploy.
+HERO_BODY = CachedBody.of(to_json(HERO_SLIDES))
+PROMO_BODY = CachedBody.of(to_json(PROMO_BLOCKS))
+
+
+def _encode_categories(db: Session) -> tuple[bytes, set[str]]:
+    return _categories_adapter.dump_json(get_categories_payload(db)), {"categories"}
+
+
+def _encode_public_settings(rows: list[SiteSetting]) -> tuple[bytes, set[str]]:
+    payload = SiteSettingsDict(
+        settings={row.key: row.value for row in rows if row.value is not None})
+    return payload.model_dump_json().encode(), {"settings"}
+
+
+_PUBLIC_SETTINGS = select(SiteSetting).where(SiteSetting.is_public.is_(True))
+
+
+def categories_body(db: Session) -> CachedBody:
+    """Encoded ``/api/categories`` payload, cached under the ``categories`` tag."""
+
+    return catalog_responses.fetch(("categories",), lambda: _encode_categories(db))
+
+
+async def categories_body_async(db: AsyncSession) -> CachedBody:
+    async def build() -> tuple[bytes, set[str]]:
+        return await db.run_sync(_encode_categories)
+
+    return await catalog_responses.fetch_async(("categories",), build)
+
+
+def public_settings_body(db: Session) -> CachedBody:
+    """Encoded ``/api/settings/public`` payload, cached under the ``settings`` tag."""
+
+    def build() -> tuple[bytes, set[str]]:
+        return _encode_public_settings(db.execute(_PUBLIC_SETTINGS).scalars().all())
+
+    return settings_responses.fetch(("public",), build)
+
+
+async def public_settings_body_async(db: AsyncSession) -> CachedBody:
+    async def build() -> tuple[bytes, set[str]]:
+        return _encode_public_settings((await db.execute(_PUBLIC_SETTINGS)).scalars().all())
+
+    return await settings_responses.fetch_async(("public",), build)
+
+
+# The last bundle, keyed by the ETags of its parts.
+_BOOTSTRAP: dict[str, tuple[tuple[str, ...], CachedBody] | None] = {"entry": None}
+_BOOTSTRAP_LOCK = Lock()
+
+
+def bootstrap_body(db: Session) -> CachedBody:
+    """Settings, categories, hero and promo in one pre-encoded document.
+
+    The parts come from their own caches, so the bundle is only re-spliced
+    when one of their ETags changes; ``version`` is derived from those ETags.
+    """
+
+    parts = {
+        "settings": public_settings_body(db),
+        "categories": categories_body(db),
+        "hero": HERO_BODY,
+        "promo": PROMO_BODY,
+    }
+    signature = tuple(part.etag for part in parts.values())
+    entry = _BOOTSTRAP["entry"]
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+
+    version = blake2b("|".join(signature).encode(), digest_size=8).hexdigest()
+    body = b"".join([
+        b'{"version":"', version.encode(), b'"',
+        *(b',"%s":%s' % (name.encode(), part.body) for name, part in parts.items()),
+        b"}",
+    ])
+    cached = CachedBody(
+        body=body,
+        etag=f'"{version}"',
+        last_modified=max(part.last_modified for part in parts.values()),
+    )
+    with _BOOTSTRAP_LOCK:
+        _BOOTSTRAP["entry"] = (signature, cached)
+    return cached
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from threading import Event, Lock, Thread
+from typing import Iterable, Mapping
+import logging
+import secrets
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.stock_hold import StockHold
+from app.services.catalog_cache import invalidate_product_counts
+from app.services.catalog_listing import refresh_listing_stock
+from app.services.response_cache import catalog_responses
+from app.services.stock import release_stock, reserve_stock
+
+
+logger = logging.getLogger(__name__)
+
+
+def _totals(rows: Iterable[tuple[int, int]]) -> dict[int, int]:
+    totals: dict[int, int] = defaultdict(int)
+    for product_id, quantity in rows:
+        totals[product_id] += quantity
+    return dict(totals)
+
+
+def _claim(db: Session, token: str) -> tuple[dict[int, int], datetime | None]:
+    rows = db.execute(
+        delete(StockHold)
+        .where(StockHold.token == token)
+        .returning(StockHold.product_id, StockHold.quantity, StockHold.created_at)
+    ).all()
+    started = min((row.created_at for row in rows), default=None)
+    return _totals((row.product_id, row.quantity) for row in rows), started
+
+
+def claim_hold(db: Session, token: str) -> dict[int, int]:
+    """Delete the hold ``token`` and return its units per product.
+
+    The rows are removed with ``DELETE ... RETURNING``, so a hold is claimed
+    exactly once even if a checkout and the sweeper race for it. The units
+    are still counted in ``reserved_stock``; the caller passes them on as
+    ``released`` to ``take_stock``/``reserve_stock``.
+    """
+
+    return _claim(db, token)[0]
+
+
+class HoldExpired(ValueError):
+    """The hold reached ``CART_HOLD_MAX_LIFETIME_SECONDS`` and was released."""
+
+
+def hold_quantities(quantities: Mapping[int, int]) -> dict[int, int]:
+    """``quantities`` capped at ``CART_HOLD_MAX_UNITS`` per product.
+
+    Holds are anonymous, so without a cap one client could reserve a whole
+    product's stock; anything above the cap is simply not held and is
+    checked at checkout like an unheld cart.
+    """
+
+    return {pid: min(qty, settings.CART_HOLD_MAX_UNITS) for pid, qty in quantities.items()}
+
+
+def place_hold(
+    db: Session,
+    quantities: Mapping[int, int],
+    token: str | None = None,
+) -> tuple[str, datetime]:
+    """Reserve ``quantities`` for ``CART_HOLD_TTL_SECONDS``.
+
+    Passing the ``token`` of a live hold replaces it and extends it, but
+    never past ``CART_HOLD_MAX_LIFETIME_SECONDS`` after it was first placed;
+    an unknown or already released token gets a fresh one. Returns
+    ``(token, expires_at)``. Raises ``OutOfStock``, or ``HoldExpired`` once
+    the hold can no longer be extended (its stock is released); the caller
+    commits in both the success and the ``HoldExpired`` case.
+    """
+
+    now = datetime.utcnow()
+    released, started = _claim(db, token) if token else ({}, None)
+    if not released:
+        token, started = secrets.token_urlsafe(24), now
+    expires_at = min(
+        now + timedelta(seconds=settings.CART_HOLD_TTL_SECONDS),
+        started + timedelta(seconds=settings.CART_HOLD_MAX_LIFETIME_SECONDS),
+    )
+    if expires_at <= now:
+        release_stock(db, released)
+        refresh_listing_stock(db, released)
+        raise HoldExpired("The hold cannot be extended any further")
+    reserve_stock(db, quantities, released)
+
+    db.add_all(
+        StockHold(token=token, product_id=product_id, quantity=quantity,
+                  expires_at=expires_at, created_at=started)
+        for product_id, quantity in quantities.items()
+    )
+    refresh_listing_stock(db, set(quantities) | set(released))
+    return token, expires_at
+
+
+def stock_changed(product_ids: Iterable[int] = ()) -> None:
+    """Drop cached availability after reservations of ``product_ids`` change."""
+
+    invalidate_product_counts()
+    catalog_responses.purge("inventory", *(f"product:{pid}" for pid in product_ids))
+
+
+def release_expired_holds(batch_size: int = 500) -> int:
+    """Give back the stock of expired holds; returns the rows released.
+
+    Works through the ``expires_at`` index in batches, each one transaction
+    with a single ``DELETE`` and a single inventory ``UPDATE``.
+    """
+
+    released = 0
+    now = datetime.utcnow()
+    while True:
+        db = SessionLocal()
+        try:
+            ids = db.scalars(
+                select(StockHold.id)
+                .where(StockHold.expires_at <= now)
+                .order_by(StockHold.expires_at)
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                break
+            rows = db.execute(
+                delete(StockHold)
+                .where(StockHold.id.in_(ids))
+                .returning(StockHold.product_id, StockHold.quantity)
+            ).all()
+            totals = _totals(rows)
+            release_stock(db, totals)
+            refresh_listing_stock(db, totals)
+            db.commit()
+        finally:
+            db.close()
+        released += len(rows)
+        stock_changed(totals)
+        if len(ids) < batch_size:
+            break
+    return released
+
+
+class HoldSweeper:
+    """Thread that releases expired holds; started and stopped in ``lifespan``."""
+
+    def __init__(self, interval_seconds: float = 30.0):
+        self.interval_seconds = interval_seconds
+        self._stop = Event()
+        self._thread: Thread | None = None
+        self._lock = Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name="hold-sweeper", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            self._stop.set()
+            if self._thread is not None:
+                self._thread.join(timeout)
+                self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                release_expired_holds()
+            except Exception:
+                logger.exception("Releasing expired stock holds failed")
+            self._stop.wait(self.interval_seconds)
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from threading import Lock
 from time import monotonic
-from typing import Any
+from typing import Any, Callable, Literal
 
 from sqlalchemy.orm import Session
 
 from app.models.product import Category
-from app.schemas.product import CategoryOut
+from app.schemas.product import CategoryOut, ProductFacetsOut
+from app.services.catalog_query import ProductFilters
 
 
 @dataclass(frozen=True)
@@ -21,12 +23,114 @@ _CACHE_KEY = "entry"
 _CACHE_TTL_SECONDS = 60.0
 
 
+@dataclass(frozen=True)
+class _CountEntry:
+    stored_at: float
+    generation: int
+    total: int
+
+
+CountMode = Literal["exact", "estimate", "none"]
+
+_COUNTS_CACHE: dict[ProductFilters, _CountEntry] = {}
+_COUNTS_LOCK = Lock()
+_COUNTS_STATE = {"generation": 0}
+_COUNTS_MAX_ENTRIES = 2048
+# Exact counts are only served from entries written since the last catalog
+# write; the TTL bounds drift from writes made by other worker processes.
+_COUNTS_EXACT_TTL_SECONDS = 60.0
+# Estimates may outlive invalidation and are refreshed lazily.
+_COUNTS_ESTIMATE_TTL_SECONDS = 600.0
+
+
+@dataclass(frozen=True)
+class _FacetsEntry:
+    stored_at: float
+    generation: int
+    payload: ProductFacetsOut
+
+
+# Facets share the listing generation so they go stale on the same writes.
+_FACETS_CACHE: dict[ProductFilters, _FacetsEntry] = {}
+
+
 def invalidate_categories_cache() -> None:
     """Reset the in-memory cache for public category payloads."""
 
     _CATEGORIES_CACHE[_CACHE_KEY] = None
 
 
+def invalidate_product_counts() -> None:
+    """Mark every cached listing total and facet payload as stale.
+
+    Call after any write that can change which products match a filter:
+    product, inventory and category edits, and stock decrements on checkout.
+    """
+
+    with _COUNTS_LOCK:
+        _COUNTS_STATE["generation"] += 1
+
+
+def get_product_count(
+    filters: ProductFilters,
+    mode: CountMode,
+    compute: Callable[[], int],
+) -> int | None:
+    """Return the listing total for ``filters`` according to ``mode``.
+
+    ``exact`` serves a cached value only if no catalog write happened since
+    it was stored, ``estimate`` tolerates stale values for a while, and
+    ``none`` skips counting entirely. ``compute`` runs the real ``COUNT``
+    on a miss.
+    """
+
+    if mode == "none":
+        return None
+
+    now = monotonic()
+    generation = _COUNTS_STATE["generation"]
+    entry = _COUNTS_CACHE.get(filters)
+    if entry is not None:
+        age = now - entry.stored_at
+        if mode == "exact" and entry.generation == generation and age < _COUNTS_EXACT_TTL_SECONDS:
+            return entry.total
+        if mode == "estimate" and age < _COUNTS_ESTIMATE_TTL_SECONDS:
+            return entry.total
+
+    total = compute()
+    with _COUNTS_LOCK:
+        if len(_COUNTS_CACHE) >= _COUNTS_MAX_ENTRIES:
+            _COUNTS_CACHE.clear()
+        _COUNTS_CACHE[filters] = _CountEntry(
+            stored_at=now, generation=generation, total=total)
+    return total
+
+
+def get_product_facets(
+    filters: ProductFilters,
+    compute: Callable[[], ProductFacetsOut],
+) -> ProductFacetsOut:
+    """Return cached facet aggregates for ``filters``, computing on a miss."""
+
+    now = monotonic()
+    generation = _COUNTS_STATE["generation"]
+    entry = _FACETS_CACHE.get(filters)
+    if (
+        entry is not None
+        and entry.generation == generation
+        and now - entry.stored_at < _COUNTS_EXACT_TTL_SECONDS
+    ):
+        return entry.payload
+
+    payload = compute()
+    with _COUNTS_LOCK:
+        if len(_FACETS_CACHE) >= _COUNTS_MAX_ENTRIES:
+            _FACETS_CACHE.clear()
+        _FACETS_CACHE[filters] = _FacetsEntry(
+            stored_at=now, generation=generation, payload=payload)
+    return payload
+
+
 def _serialize_categories(rows: list[Category]) -> list[CategoryOut]:
     return [
         CategoryOut(
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from sqlalchemy import and_, case, func, literal
+from sqlalchemy.orm import Session
+
+from app.models.catalog import CatalogListing
+from app.schemas.product import (
+    CategoryFacet,
+    PriceBucket,
+    PriceFacet,
+    ProductFacetsOut,
+)
+from app.services.catalog_query import ProductFilters
+
+
+# Lower bounds of the price histogram buckets (roubles); the last bucket is
+# open-ended. Fixed edges keep buckets stable between requests and caches.
+PRICE_BUCKET_EDGES = (0, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+
+
+def compute_facets(db: Session, filters: ProductFilters) -> ProductFacetsOut:
+    """Aggregate sidebar facets for ``filters`` with one grouped query.
+
+    Each facet ignores its own filter, so category counts honour the price
+    and stock filters but not the selected category, the histogram ignores
+    the price range, and so on. The query groups matching products by
+    (category, bucket, in stock, in price range) and the facets are folded
+    from those few rows in Python.
+    """
+
+    base, _ = replace(filters, category=None, price_min=None,
+                      price_max=None, in_stock=False).apply(db.query(CatalogListing))
+
+    stock_flag = case((CatalogListing.available_stock > 0, 1), else_=0)
+
+    price_conditions = []
+    if filters.price_min is not None:
+        price_conditions.append(CatalogListing.price >= filters.price_min)
+    if filters.price_max is not None:
+        price_conditions.append(CatalogListing.price <= filters.price_max)
+    price_flag = case((and_(*price_conditions), 1), else_=0) if price_conditions else literal(1)
+
+    bucket = case(
+        *[(CatalogListing.price < edge, index) for index, edge in enumerate(PRICE_BUCKET_EDGES[1:])],
+        else_=len(PRICE_BUCKET_EDGES) - 1,
+    )
+
+    # A constant flag must not appear in GROUP BY (Postgres reads it as a
+    # column position).
+    grouping = [CatalogListing.category_id, bucket, stock_flag]
+    if price_conditions:
+        grouping.append(price_flag)
+
+    rows = (
+        base.with_entities(
+            CatalogListing.category_id,
+            bucket,
+            stock_flag,
+            price_flag,
+            func.count(CatalogListing.product_id),
+            func.min(CatalogListing.price),
+            func.max(CatalogListing.price),
+        )
+        .group_by(*grouping)
+        .all()
+    )
+
+    total = 0
+    in_stock = 0
+    category_counts: dict[int | None, int] = {}
+    bucket_counts = [0] * len(PRICE_BUCKET_EDGES)
+    price_min: int | None = None
+    price_max: int | None = None
+
+    for category_id, bucket_index, is_available, in_price, count, low, high in rows:
+        category_ok = not filters.category or category_id == filters.category
+        stock_ok = not filters.in_stock or bool(is_available)
+        price_ok = bool(in_price)
+
+        if price_ok and stock_ok:
+            category_counts[category_id] = category_counts.get(category_id, 0) + count
+        if category_ok and price_ok and is_available:
+            in_stock += count
+        if category_ok and stock_ok:
+            bucket_counts[int(bucket_index)] += count
+            price_min = low if price_min is None else min(price_min, low)
+            price_max = high if price_max is None else max(price_max, high)
+            if price_ok:
+                total += count
+
+    buckets = [
+        PriceBucket(
+            min=edge,
+            max=PRICE_BUCKET_EDGES[index + 1] if index + 1 < len(PRICE_BUCKET_EDGES) else None,
+            count=bucket_counts[index],
+        )
+        for index, edge in enumerate(PRICE_BUCKET_EDGES)
+    ]
+    categories = [
+        CategoryFacet(id=category_id, count=count)
+        for category_id, count in sorted(
+            category_counts.items(), key=lambda item: (-item[1], item[0] or 0))
+    ]
+    return ProductFacetsOut(
+        total=total,
+        in_stock=in_stock,
+        categories=categories,
+        price=PriceFacet(min=price_min, max=price_max, buckets=buckets),
+    )
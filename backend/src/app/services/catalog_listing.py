@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+from sqlalchemy import case, delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Load, Session, load_only
+
+from app.models.catalog import CatalogListing
+from app.models.product import Category, Inventory, Product
+from app.schemas.product import ProductOut
+from app.services.product_media import image_to_out, load_galleries, product_to_out
+
+
+def _category_paths(db: Session) -> dict[int, tuple[str, str]]:
+    """Map category id to ``(slug, path)`` where path joins ancestor slugs."""
+
+    rows = db.query(Category.id, Category.slug, Category.parent_id).all()
+    by_id = {row.id: row for row in rows}
+    paths: dict[int, tuple[str, str]] = {}
+    for row in rows:
+        slugs: list[str] = []
+        seen: set[int] = set()
+        current = row
+        while current is not None and current.id not in seen:
+            seen.add(current.id)
+            slugs.append(current.slug)
+            current = by_id.get(current.parent_id) if current.parent_id else None
+        paths[row.id] = (row.slug, "/".join(reversed(slugs)))
+    return paths
+
+
+_UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def _build_rows(db: Session, products: Sequence[Product]) -> list[dict]:
+    if not products:
+        return []
+    ids = [product.id for product in products]
+    stock = {
+        inv.product_id: max(0, inv.current_stock - inv.reserved_stock)
+        for inv in db.query(Inventory).filter(Inventory.product_id.in_(ids))
+    }
+    galleries = load_galleries(db, ids)
+    categories = _category_paths(db)
+
+    rows: list[dict] = []
+    for product in products:
+        out = product_to_out(product, galleries.get(product.id))
+        slug, path = categories.get(product.category_id, (None, None))
+        rows.append(dict(
+            product_id=product.id,
+            name=product.name,
+            description=product.description,
+            price=product.price,
+            category_id=product.category_id,
+            category_slug=slug,
+            category_path=path,
+            created_at=product.created_at,
+            available_stock=stock.get(product.id),
+            image=out.image,
+            images=out.images,
+            gallery=[item.model_dump() for item in out.gallery] if out.gallery else None,
+        ))
+    return rows
+
+
+def refresh_listing(db: Session, product_ids: Iterable[int]) -> None:
+    """Recompute read-model rows for ``product_ids`` inside the current transaction.
+
+    Pending ORM changes are flushed first so the rows reflect them; inactive
+    or deleted products simply lose their row. Rows are written with an
+    upsert, so two transactions refreshing the same product cannot collide
+    on its primary key. The caller commits.
+    """
+
+    ids = sorted({int(pid) for pid in product_ids if pid is not None})
+    if not ids:
+        return
+    db.flush()
+    products = (
+        db.query(Product)
+        .filter(Product.id.in_(ids), Product.active.is_(True))
+        .all()
+    )
+    listed = [product.id for product in products]
+    db.execute(
+        delete(CatalogListing)
+        .where(CatalogListing.product_id.in_(ids), CatalogListing.product_id.notin_(listed))
+        .execution_options(synchronize_session=False)
+    )
+    rows = _build_rows(db, products)
+    if rows:
+        statement = _UPSERTS[db.get_bind().dialect.name](CatalogListing).values(rows)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[CatalogListing.product_id],
+            set_={name: statement.excluded[name] for name in rows[0] if name != "product_id"},
+        ))
+
+
+def refresh_listing_stock(db: Session, product_ids: Iterable[int]) -> None:
+    """Update only ``available_stock`` of the read-model rows for ``product_ids``.
+
+    For paths that change nothing but inventory (checkouts, stock holds):
+    one ``UPDATE`` instead of rebuilding the rows. The caller commits.
+    """
+
+    ids = sorted({int(pid) for pid in product_ids if pid is not None})
+    if not ids:
+        return
+    db.flush()
+    available = (
+        select(case(
+            (Inventory.current_stock > Inventory.reserved_stock,
+             Inventory.current_stock - Inventory.reserved_stock),
+            else_=0,
+        ))
+        .where(Inventory.product_id == CatalogListing.product_id)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(CatalogListing)
+        .where(CatalogListing.product_id.in_(ids))
+        .values(available_stock=available)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def category_product_ids(db: Session, category_id: int) -> list[int]:
+    """Products in ``category_id`` or any of its descendants.
+
+    These are the read-model rows whose ``category_slug``/``category_path``
+    change when the category is renamed, moved or deleted.
+    """
+
+    children: dict[int | None, list[int]] = {}
+    for row in db.query(Category.id, Category.parent_id):
+        children.setdefault(row.parent_id, []).append(row.id)
+    subtree: set[int] = set()
+    pending = [category_id]
+    while pending:
+        current = pending.pop()
+        if current in subtree:
+            continue
+        subtree.add(current)
+        pending.extend(children.get(current, ()))
+    return [
+        row[0] for row in
+        db.query(Product.id).filter(Product.category_id.in_(subtree))
+    ]
+
+
+def rebuild_listing(db: Session, batch_size: int = 500) -> int:
+    """Regenerate the whole read model from the source tables.
+
+    Runs in the caller's transaction and returns the number of rows written.
+    """
+
+    db.flush()
+    db.execute(delete(CatalogListing))
+    written = 0
+    last_id = 0
+    while True:
+        batch = (
+            db.query(Product)
+            .filter(Product.active.is_(True), Product.id > last_id)
+            .order_by(Product.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        db.execute(insert(CatalogListing), _build_rows(db, batch))
+        written += len(batch)
+        last_id = batch[-1].id
+    return written
+
+
+# Public ProductOut field -> read-model column (``active`` is implied).
+_FIELD_COLUMNS: dict[str, str | None] = {
+    "id": "product_id",
+    "name": "name",
+    "description": "description",
+    "price": "price",
+    "category_id": "category_id",
+    "active": None,
+    "image": "image",
+    "images": "images",
+    "gallery": "gallery",
+}
+PRODUCT_FIELDS = frozenset(_FIELD_COLUMNS)
+
+
+def parse_fields(raw: str | None) -> frozenset[str] | None:
+    """Parse a ``fields=id,name,price`` parameter; ``None`` means all fields.
+
+    ``id`` is always included. Raises ``ValueError`` on unknown names.
+    """
+
+    if raw is None:
+        return None
+    fields = {part.strip() for part in raw.split(",") if part.strip()}
+    unknown = fields - PRODUCT_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    fields.add("id")
+    return None if fields == PRODUCT_FIELDS else frozenset(fields)
+
+
+def listing_load_only(fields: frozenset[str] | None, *extra: str) -> Load | None:
+    """Loader option that fetches only the columns behind ``fields``.
+
+    ``extra`` names further attributes the caller reads, such as the sort
+    column needed for cursors. Returns ``None`` when every field is wanted.
+    """
+
+    if fields is None:
+        return None
+    names = {_FIELD_COLUMNS[name] for name in fields if _FIELD_COLUMNS[name]}
+    names.update(extra)
+    return load_only(*(getattr(CatalogListing, name) for name in sorted(names)))
+
+
+def excluded_fields(fields: frozenset[str] | None) -> set[str] | None:
+    """Fields to drop when dumping a sparse ProductOut built for ``fields``."""
+
+    return None if fields is None else set(PRODUCT_FIELDS - fields)
+
+
+def listing_to_out(row: CatalogListing, fields: frozenset[str] | None = None) -> ProductOut:
+    """Build the API payload for a read-model row.
+
+    With ``fields`` only those attributes are read, so deferred columns are
+    not loaded; dump the result with ``exclude=excluded_fields(fields)``.
+    """
+
+    if fields is not None:
+        values = {
+            name: (True if column is None else getattr(row, column))
+            for name, column in _FIELD_COLUMNS.items()
+            if name in fields
+        }
+        if "gallery" in values:
+            values["gallery"] = [
+                image_to_out(item) for item in values["gallery"]
+            ] if values["gallery"] else None
+        if "images" in values:
+            values["images"] = values["images"] or None
+        return ProductOut.model_construct(**values)
+
+    gallery = [image_to_out(item) for item in row.gallery] if row.gallery else None
+    return ProductOut.model_construct(
+        id=row.product_id,
+        name=row.name,
+        description=row.description,
+        price=row.price,
+        category_id=row.category_id,
+        active=True,
+        image=row.image,
+        images=row.images or None,
+        gallery=gallery,
+    )
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.catalog import CatalogListing
+from app.models.product import Product
+from app.services.product_search import apply_search
+
+
+@dataclass(frozen=True)
+class ProductFilters:
+    """Normalised public catalog filters.
+
+    Instances are hashable so they double as cache keys: equivalent requests
+    (swapped price bounds, extra whitespace in ``q``) collapse to
+    the same value.
+    """
+
+    category: int | None = None
+    q: str | None = None
+    price_min: int | None = None
+    price_max: int | None = None
+    in_stock: bool = False
+
+    @classmethod
+    def from_params(
+        cls,
+        category: int | None = None,
+        q: str | None = None,
+        price_min: int | None = None,
+        price_max: int | None = None,
+        in_stock: bool = False,
+    ) -> "ProductFilters":
+        if price_min is not None and price_max is not None and price_min > price_max:
+            price_min, price_max = price_max, price_min
+        q = " ".join((q or "").split()) or None
+        return cls(
+            category=category or None,
+            q=q,
+            price_min=price_min,
+            price_max=price_max,
+            in_stock=bool(in_stock),
+        )
+
+    def apply(self, query: Query) -> tuple[Query, ColumnElement | None]:
+        """Restrict a ``CatalogListing`` query to rows matching the filters.
+
+        Returns the query and the search relevance expression, which is
+        ``None`` without a ``q`` filter or when the search backend cannot
+        rank. The read model only holds active products and carries
+        precomputed stock, so ``products`` is joined (on its primary key)
+        only when searching.
+        """
+
+        rank = None
+        if self.category:
+            query = query.filter(CatalogListing.category_id == self.category)
+        if self.q:
+            query = query.join(Product, Product.id == CatalogListing.product_id)
+            query, rank = apply_search(query, self.q)
+        if self.price_min is not None:
+            query = query.filter(CatalogListing.price >= self.price_min)
+        if self.price_max is not None:
+            query = query.filter(CatalogListing.price <= self.price_max)
+        if self.in_stock:
+            query = query.filter(CatalogListing.available_stock > 0)
+        return query, rank
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any
+import hashlib
+import time
+
+from pydantic import BaseModel
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.idempotency import IdempotencyKey
+
+
+class IdempotencyKeyReused(ValueError):
+    """The key was already used for a request with a different body."""
+
+
+class IdempotencyKeyBusy(ValueError):
+    """The original request is still running after the wait timed out."""
+
+
+class IdempotencyKeyLost(ValueError):
+    """A retry took the key over while this request was still working."""
+
+
+@dataclass(frozen=True)
+class IdempotencyClaim:
+    """Outcome of ``begin_request``.
+
+    With ``response`` set the key was already used and the response is to be
+    replayed. Otherwise the caller owns the key: ``locked_at`` identifies its
+    claim, so a request whose claim was taken over can no longer complete.
+    """
+
+    scope: str
+    key: str
+    locked_at: datetime | None = None
+    response: dict[str, Any] | None = None
+
+
+# A request that holds a key this long without finishing is assumed dead
+# and its key may be taken over by a retry.
+_LOCK_TIMEOUT = timedelta(minutes=2)
+_POLL_SECONDS = 0.1
+_PRUNE_EVERY_SECONDS = 600.0
+
+_PRUNE_LOCK = Lock()
+_PRUNE_STATE = {"next_at": 0.0}
+
+
+def request_fingerprint(payload: BaseModel) -> str:
+    """Hash identifying the request body a key was first used with."""
+
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+
+def _retention() -> timedelta:
+    return timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+
+def _prune_if_due(db: Session) -> None:
+    # Piggybacks on requests instead of a scheduler: at most one indexed
+    # DELETE per process every few minutes.
+    now = time.monotonic()
+    with _PRUNE_LOCK:
+        if now < _PRUNE_STATE["next_at"]:
+            return
+        _PRUNE_STATE["next_at"] = now + _PRUNE_EVERY_SECONDS
+    db.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.created_at < datetime.utcnow() - _retention())
+    )
+    db.commit()
+
+
+def begin_request(scope: str, key: str, fingerprint: str) -> IdempotencyClaim:
+    """Claim ``key`` for this request, or return the response it already has.
+
+    Without a ``response`` the caller now owns the key and must either
+    ``complete_request`` (in the transaction that does the work) or
+    ``release_request``. The stored response is returned when the key was
+    used before with the same body. While another request with the key is in
+    progress this waits for it, up to ``IDEMPOTENCY_WAIT_SECONDS``, so
+    duplicates never run concurrently.
+
+    Raises ``IdempotencyKeyReused`` if the body differs from the first use
+    and ``IdempotencyKeyBusy`` if the wait times out. The claim is committed
+    in its own short transaction so that other workers and processes see it.
+    """
+
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        db = SessionLocal()
+        try:
+            _prune_if_due(db)
+            now = datetime.utcnow()
+            db.add(IdempotencyKey(scope=scope, key=key, request_hash=fingerprint,
+                                  status="in_progress", locked_at=now, created_at=now))
+            try:
+                db.commit()
+                return IdempotencyClaim(scope, key, locked_at=now)
+            except IntegrityError:
+                db.rollback()
+
+            row = (
+                db.query(IdempotencyKey)
+                .filter(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+                .first()
+            )
+            if row is None:
+                # The other request failed and let go of the key; try again.
+                continue
+            if row.created_at < now - _retention():
+                db.delete(row)
+                db.commit()
+                continue
+            if row.request_hash != fingerprint:
+                raise IdempotencyKeyReused(
+                    "Idempotency-Key was already used with a different request")
+            if row.status == "done":
+                return IdempotencyClaim(scope, key, response=row.response)
+            if row.locked_at < now - _LOCK_TIMEOUT:
+                taken = db.execute(
+                    update(IdempotencyKey)
+                    .where(IdempotencyKey.id == row.id,
+                           IdempotencyKey.status == "in_progress",
+                           IdempotencyKey.locked_at == row.locked_at)
+                    .values(locked_at=now)
+                ).rowcount
+                db.commit()
+                if taken:
+                    return IdempotencyClaim(scope, key, locked_at=now)
+        finally:
+            db.close()
+        if time.monotonic() >= deadline:
+            raise IdempotencyKeyBusy(
+                "A request with this Idempotency-Key is still being processed")
+        time.sleep(_POLL_SECONDS)
+
+
+def _owned_by(claim: IdempotencyClaim):
+    return (
+        IdempotencyKey.scope == claim.scope,
+        IdempotencyKey.key == claim.key,
+        IdempotencyKey.status == "in_progress",
+        IdempotencyKey.locked_at == claim.locked_at,
+    )
+
+
+def complete_request(db: Session, claim: IdempotencyClaim, response: dict[str, Any]) -> None:
+    """Store the response for replays; call inside the work's own transaction
+    so the outcome and the record of it commit together.
+
+    Raises ``IdempotencyKeyLost`` if the claim was taken over by a retry in
+    the meantime; the caller must then roll its work back, since the retry
+    is doing (or has done) the same thing.
+    """
+
+    stored = db.execute(
+        update(IdempotencyKey)
+        .where(*_owned_by(claim))
+        .values(status="done", response=response)
+    ).rowcount
+    if not stored:
+        raise IdempotencyKeyLost(
+            "This request was taken over by a retry with the same Idempotency-Key")
+
+
+def release_request(claim: IdempotencyClaim) -> None:
+    """Forget a claimed key after the request failed, so a retry runs again.
+
+    Does nothing if the claim was taken over by another request.
+    """
+
+    db = SessionLocal()
+    try:
+        db.execute(delete(IdempotencyKey).where(*_owned_by(claim)))
+        db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.services.uploads import uploads_root, url_to_relative
+
+
+# Target widths for catalog cards, product pages and zoomed views.
+VARIANT_WIDTHS = (200, 400, 800)
+WEBP_QUALITY = 80
+FALLBACK_QUALITY = 85
+
+
+def _fallback_format(image: Image.Image) -> tuple[str, str]:
+    """Non-WebP format for older clients: PNG keeps transparency, else JPEG."""
+
+    has_alpha = image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info)
+    return ("png", ".png") if has_alpha else ("jpeg", ".jpg")
+
+
+def _save(image: Image.Image, path: Path, fmt: str) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    if fmt == "webp":
+        image.save(tmp, "WEBP", quality=WEBP_QUALITY, method=4)
+    elif fmt == "jpeg":
+        image.convert("RGB").save(tmp, "JPEG", quality=FALLBACK_QUALITY,
+                                  optimize=True, progressive=True)
+    else:
+        image.save(tmp, "PNG", optimize=True)
+    tmp.replace(path)
+
+
+def probe_image(relative: Path) -> tuple[int, int]:
+    """Pixel size of an uploaded image; ``ValueError`` if it is not one.
+
+    Only the header is parsed, so this is cheap enough for the request path.
+    """
+
+    try:
+        with Image.open(uploads_root() / relative) as opened:
+            opened.verify()
+        with Image.open(uploads_root() / relative) as opened:
+            width, height = opened.size
+            transposed = opened.getexif().get(0x0112) in (5, 6, 7, 8)
+    except (UnidentifiedImageError, OSError, SyntaxError) as exc:
+        raise ValueError(f"Not a readable image: {relative}") from exc
+    # Report the size as displayed, i.e. after EXIF rotation.
+    return (height, width) if transposed else (width, height)
+
+
+def generate_variants(relative: Path) -> tuple[int, int, list[dict]]:
+    """Write resized WebP and fallback copies next to an uploaded image.
+
+    ``relative`` is the original's path under ``UPLOADS_DIR``. Returns the
+    original's ``(width, height)`` and the variant list stored on
+    ``ProductImage.variants``. Images are never upscaled; one that is already
+    narrower than the smallest width gets a single re-encoded copy. Raises
+    ``ValueError`` if the file is not a readable image.
+    """
+
+    source = uploads_root() / relative
+    try:
+        with Image.open(source) as opened:
+            image = ImageOps.exif_transpose(opened)
+            image.load()
+    except (UnidentifiedImageError, OSError) as exc:
+        raise ValueError(f"Not a readable image: {relative}") from exc
+
+    if image.mode not in ("RGB", "RGBA", "L", "LA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    width, height = image.size
+    fallback, fallback_suffix = _fallback_format(image)
+
+    targets = sorted({min(target, width) for target in VARIANT_WIDTHS})
+    variants: list[dict] = []
+    for target in targets:
+        target_height = max(1, round(height * target / width))
+        resized = image if target == width else image.resize(
+            (target, target_height), Image.Resampling.LANCZOS)
+        # Derived from the content-hashed original, so the names are stable
+        # and the files can be cached as immutable too.
+        for fmt, suffix in (("webp", ".webp"), (fallback, fallback_suffix)):
+            name = f"{source.stem}-{target}w{suffix}"
+            _save(resized, source.with_name(name), fmt)
+            variants.append({
+                "url": f"/uploads/{(relative.parent / name).as_posix()}",
+                "width": target,
+                "height": target_height,
+                "format": fmt,
+            })
+    return width, height, variants
+
+
+def variant_paths(variants: list[dict] | None) -> list[Path]:
+    """Relative paths of derivative files, for cleanup when an image goes."""
+
+    paths = (url_to_relative(variant.get("url", "")) for variant in variants or ())
+    return [path for path in paths if path is not None]
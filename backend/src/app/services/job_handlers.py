@@ -0,0 +1,48 @@
+"""Handlers for background jobs; imported at start-up to register them."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.models.product import ProductImage
+from app.services.catalog_listing import refresh_listing
+from app.services.image_variants import generate_variants
+from app.services.jobs import job_handler
+from app.services.product_media import unreferenced_image_files
+from app.services.response_cache import catalog_responses
+from app.services.uploads import delete_upload_files, uploads_root, url_to_relative
+
+
+@job_handler("delete_files")
+def delete_files(db: Session, payload: dict[str, Any]) -> None:
+    """Remove the files of deleted ``images``, then ``dirs`` if they are empty.
+
+    Whether a file is still referenced is decided here, not when the job was
+    queued: the same bytes may have been uploaded again in the meantime, and
+    that upload re-uses the existing content-addressed file.
+    """
+
+    delete_upload_files(unreferenced_image_files(db, payload.get("images", ())))
+    root = uploads_root()
+    for folder in payload.get("dirs", ()):
+        try:
+            (root / folder).rmdir()
+        except OSError:
+            # Missing or still holding files that belong to someone else.
+            pass
+
+
+@job_handler("generate_image_variants")
+def generate_image_variants(db: Session, payload: dict[str, Any]) -> None:
+    image = db.get(ProductImage, payload["image_id"])
+    if image is None or (image.variants and not payload.get("force")):
+        return
+    relative = url_to_relative(image.url)
+    if relative is None:
+        return
+    image.width, image.height, image.variants = generate_variants(relative)
+    refresh_listing(db, [image.product_id])
+    db.commit()
+    catalog_responses.purge(f"product:{image.product_id}")
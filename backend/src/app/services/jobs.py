@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from threading import Event, Lock, Thread
+from typing import Any, Callable
+import logging
+import random
+
+from sqlalchemy import delete, event, update
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.job import Job
+
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Session, dict[str, Any]], None]
+
+_HANDLERS: dict[str, JobHandler] = {}
+_WAKE = Event()
+
+# Retry delay grows as 2**attempt seconds up to this cap, with jitter.
+_BACKOFF_CAP_SECONDS = 300.0
+# A job still "running" after this long belonged to a worker that died.
+_STALE_RUNNING = timedelta(minutes=15)
+_DONE_RETENTION = timedelta(days=7)
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register ``handler(db, payload)`` for jobs of ``kind``.
+
+    Handlers run in a worker thread with their own session, which is
+    committed when they return. Raising marks the attempt as failed.
+    """
+
+    def register(handler: JobHandler) -> JobHandler:
+        _HANDLERS[kind] = handler
+        return handler
+
+    return register
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    delay_seconds: float = 0,
+    max_attempts: int = 5,
+) -> Job:
+    """Add a job to the caller's transaction; it runs once that commits."""
+
+    if kind not in _HANDLERS:
+        raise ValueError(f"No handler registered for job kind {kind!r}")
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        status="queued",
+        attempts=0,
+        max_attempts=max_attempts,
+        run_after=datetime.utcnow() + timedelta(seconds=delay_seconds),
+        created_at=datetime.utcnow(),
+    )
+    db.add(job)
+    db.info["jobs_enqueued"] = True
+    return job
+
+
+def requeue(db: Session, job: Job) -> None:
+    """Give a failed job a fresh set of attempts, due immediately."""
+
+    job.status = "queued"
+    job.attempts = 0
+    job.run_after = datetime.utcnow()
+    job.finished_at = None
+    db.info["jobs_enqueued"] = True
+
+
+def _notify_committed(session: Session) -> None:
+    # Wake idle workers as soon as a transaction that enqueued jobs commits.
+    if session.info.pop("jobs_enqueued", False):
+        _WAKE.set()
+
+
+event.listen(SessionLocal, "after_commit", _notify_committed)
+
+
+def backoff_seconds(attempt: int) -> float:
+    delay = min(_BACKOFF_CAP_SECONDS, 2.0 ** attempt)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _claim_next(db: Session) -> Job | None:
+    now = datetime.utcnow()
+    candidates = (
+        db.query(Job.id)
+        .filter(Job.status == "queued", Job.run_after <= now)
+        .order_by(Job.run_after.asc(), Job.id.asc())
+        .limit(5)
+        .all()
+    )
+    for (job_id,) in candidates:
+        # Conditional update so concurrent workers (threads or processes)
+        # never claim the same job.
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "queued")
+            .values(status="running", attempts=Job.attempts + 1, locked_at=now)
+        ).rowcount
+        db.commit()
+        if claimed:
+            return db.get(Job, job_id)
+    return None
+
+
+def _finish(job_id: int, error: BaseException | None) -> None:
+    db = SessionLocal()
+    try:
+        job = db.get(Job, job_id)
+        if job is None:
+            return
+        job.locked_at = None
+        if error is None:
+            job.status = "done"
+            job.last_error = None
+            job.finished_at = datetime.utcnow()
+        elif job.attempts >= job.max_attempts:
+            job.status = "failed"
+            job.last_error = repr(error)[:4000]
+            job.finished_at = datetime.utcnow()
+        else:
+            job.status = "queued"
+            job.last_error = repr(error)[:4000]
+            job.run_after = datetime.utcnow() + timedelta(seconds=backoff_seconds(job.attempts))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_next_job() -> bool:
+    """Claim and run one due job. Returns ``False`` when nothing was due."""
+
+    db = SessionLocal()
+    try:
+        job = _claim_next(db)
+        if job is None:
+            return False
+        job_id, kind, payload = job.id, job.kind, dict(job.payload or {})
+        handler = _HANDLERS.get(kind)
+        error: BaseException | None = None
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {kind!r}")
+            handler(db, payload)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            logger.warning("Job %s (%s) attempt failed: %r", job_id, kind, exc)
+            error = exc
+    finally:
+        db.close()
+    _finish(job_id, error)
+    return True
+
+
+def recover_jobs() -> None:
+    """Requeue jobs orphaned by a crashed worker and prune old finished ones."""
+
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(Job)
+            .where(Job.status == "running", Job.locked_at < now - _STALE_RUNNING)
+            .values(status="queued", locked_at=None, run_after=now)
+        )
+        db.execute(
+            delete(Job).where(Job.status == "done", Job.finished_at < now - _DONE_RETENTION))
+        db.commit()
+    finally:
+        db.close()
+
+
+class JobWorkerPool:
+    """Threads that poll the ``jobs`` table; started and stopped in ``lifespan``."""
+
+    def __init__(self, workers: int = 2, poll_seconds: float = 5.0):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self._stop = Event()
+        self._threads: list[Thread] = []
+        self._lock = Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            recover_jobs()
+            self._stop.clear()
+            for index in range(self.workers):
+                thread = Thread(target=self._run, name=f"job-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            self._stop.set()
+            _WAKE.set()
+            for thread in self._threads:
+                thread.join(timeout)
+            self._threads.clear()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if run_next_job():
+                    continue
+            except Exception:
+                logger.exception("Job worker error")
+            _WAKE.wait(self.poll_seconds)
+            _WAKE.clear()
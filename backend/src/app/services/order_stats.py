@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import random
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.order import OrderCount
+
+
+_UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+# Counter rows per status. A checkout locks one of them until it commits,
+# so up to this many checkouts can update the counters at the same time.
+ORDER_COUNT_SLOTS = 16
+
+
+def adjust_order_count(db: Session, status: str, delta: int) -> None:
+    """Add ``delta`` to the counter for ``status`` in the current transaction.
+
+    Call from every path that creates orders or changes their status, as
+    late as possible before the commit. The change goes to a random slot
+    row of the status; single slots may go negative when orders leave a
+    status, only their sum is meaningful.
+    """
+
+    insert = _UPSERTS[db.get_bind().dialect.name]
+    slot = random.randrange(ORDER_COUNT_SLOTS)
+    statement = insert(OrderCount).values(status=status, slot=slot, count=delta)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[OrderCount.status, OrderCount.slot],
+        set_={"count": OrderCount.count + delta},
+    ))
+
+
+def move_order_count(db: Session, old_status: str, new_status: str) -> None:
+    if old_status != new_status:
+        adjust_order_count(db, old_status, -1)
+        adjust_order_count(db, new_status, 1)
+
+
+def order_total(db: Session, status: str | None = None) -> int:
+    """Number of orders, optionally with one status, read from the counters."""
+
+    query = select(func.coalesce(func.sum(OrderCount.count), 0))
+    if status is not None:
+        query = query.where(OrderCount.status == status)
+    return db.scalar(query)
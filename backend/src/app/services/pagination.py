@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Decoded keyset position: the sort value and id of a boundary row."""
+
+    sort: str
+    value: Any
+    id: int
+    backward: bool = False
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Serialise a cursor into an opaque, URL-safe token."""
+
+    raw = json.dumps(
+        {
+            "s": cursor.sort,
+            "v": _encode_value(cursor.value),
+            "i": cursor.id,
+            "b": cursor.backward,
+        },
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Parse a token produced by :func:`encode_cursor`.
+
+    Raises ``ValueError`` for anything that is not a well-formed cursor so
+    routes can turn it into a 400 response.
+    """
+
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return Cursor(
+            sort=str(data["s"]),
+            value=_decode_value(data["v"]),
+            id=int(data["i"]),
+            backward=bool(data.get("b", False)),
+        )
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def keyset_condition(column, id_column, cursor: Cursor, descending: bool) -> ColumnElement[bool]:
+    """Build the ``WHERE`` clause selecting rows strictly after ``cursor``.
+
+    ``descending`` is the direction of the requested sort; backward cursors
+    walk the same ordering in reverse.
+    """
+
+    forward_desc = descending != cursor.backward
+    if forward_desc:
+        return or_(column < cursor.value, and_(column == cursor.value, id_column < cursor.id))
+    return or_(column > cursor.value, and_(column == cursor.value, id_column > cursor.id))
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from dataclasses import dataclass
 from pathlib import Path
+from threading import Lock
+from time import monotonic
 from typing import Iterable, Sequence
+import os
 import re
 import unicodedata
 
@@ -10,7 +14,9 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.product import Product, ProductImage
-from app.schemas.product import ProductImageOut, ProductOut
+from app.schemas.product import ImageVariantOut, ProductImageOut, ProductOut
+from app.services.image_variants import variant_paths
+from app.services.uploads import url_to_relative
 
 
 def _slugify(value: str) -> str:
@@ -20,17 +26,98 @@ def _slugify(value: str) -> str:
     return value or 'item'
 
 
+_IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.webp', '.gif'}
+
+
+@dataclass(frozen=True)
+class _UploadsIndex:
+    root: str
+    root_mtime: float | None
+    built_at: float
+    folders: dict[str, list[str]]
+
+
+_UPLOADS_INDEX: dict[str, _UploadsIndex | float | None] = {"entry": None, "checked_at": 0.0}
+_UPLOADS_LOCK = Lock()
+# How often the uploads root is stat()ed for changes, and the hard limit
+# after which the index is rebuilt anyway (files copied into an existing
+# folder do not change the root mtime).
+_UPLOADS_CHECK_SECONDS = 30.0
+_UPLOADS_REBUILD_SECONDS = 300.0
+
+
+def _root_mtime(root: str) -> float | None:
+    try:
+        return os.stat(root).st_mtime
+    except OSError:
+        return None
+
+
+def _scan_uploads(root: str) -> dict[str, list[str]]:
+    folders: dict[str, list[str]] = {}
+    try:
+        with os.scandir(root) as entries:
+            dirs = [entry for entry in entries if entry.is_dir()]
+    except OSError:
+        return folders
+    for entry in dirs:
+        try:
+            with os.scandir(entry.path) as files:
+                names = sorted(
+                    item.name for item in files
+                    if os.path.splitext(item.name)[1].lower() in _IMAGE_SUFFIXES
+                )
+        except OSError:
+            continue
+        if names:
+            folders[entry.name] = [f"/uploads/{entry.name}/{name}" for name in names]
+    return folders
+
+
+def invalidate_uploads_index() -> None:
+    """Force the next legacy image lookup to rescan the uploads directory."""
+
+    _UPLOADS_INDEX["entry"] = None
+
+
+def _uploads_index() -> dict[str, list[str]]:
+    root = settings.UPLOADS_DIR
+    now = monotonic()
+    entry = _UPLOADS_INDEX["entry"]
+    if (
+        entry is not None
+        and entry.root == root
+        and now - entry.built_at < _UPLOADS_REBUILD_SECONDS
+    ):
+        if now - _UPLOADS_INDEX["checked_at"] < _UPLOADS_CHECK_SECONDS:
+            return entry.folders
+        _UPLOADS_INDEX["checked_at"] = now
+        if _root_mtime(root) == entry.root_mtime:
+            return entry.folders
+
+    with _UPLOADS_LOCK:
+        current = _UPLOADS_INDEX["entry"]
+        if current is not None and current is not entry:
+            # Another thread rebuilt the index while we waited.
+            return current.folders
+        mtime = _root_mtime(root)
+        folders = _scan_uploads(root)
+        _UPLOADS_INDEX["entry"] = _UploadsIndex(
+            root=root, root_mtime=mtime, built_at=now, folders=folders)
+        _UPLOADS_INDEX["checked_at"] = now
+    return folders
+
+
+def legacy_image_urls(name: str) -> list[str]:
+    """Image URLs found in the slug-named uploads folder for ``name``."""
+
+    return list(_uploads_index().get(_slugify(name), ()))
+
+
 def _legacy_images(name: str) -> list[str]:
-    slug = _slugify(name)
-    base = Path(settings.UPLOADS_DIR)
-    folder = base / slug
-    if not folder.exists() or not folder.is_dir():
+    if not settings.LEGACY_IMAGES_FALLBACK:
         return []
-    urls: list[str] = []
-    for item in sorted(folder.iterdir()):
-        if item.suffix.lower() in {'.jpg', '.jpeg', '.png', '.webp', '.gif'}:
-            urls.append(f"/uploads/{slug}/{item.name}")
-    return urls
+    return legacy_image_urls(name)
 
 
 def load_galleries(db: Session, product_ids: Iterable[int]) -> dict[int, list[ProductImage]]:
@@ -49,14 +136,66 @@ def load_galleries(db: Session, product_ids: Iterable[int]) -> dict[int, list[Pr
     return grouped
 
 
+def image_file_refs(images: Sequence[ProductImage]) -> list[dict]:
+    """``{"url", "variants"}`` of ``images``, for a ``delete_files`` job that
+    runs after the rows themselves are gone."""
+
+    return [{"url": image.url, "variants": image.variants or []} for image in images]
+
+
+def unreferenced_image_files(db: Session, refs: Sequence[dict]) -> list[Path]:
+    """Files of ``refs`` (originals and derivatives) that no image row uses.
+
+    Uploads are content-addressed, so one file may back images of several
+    products and may be re-used by a later upload of the same bytes; it may
+    only be removed once no ``ProductImage`` points at it. Derivatives are
+    named after their original, so checking the original's URL covers them.
+    """
+
+    urls = {ref["url"] for ref in refs}
+    if not urls:
+        return []
+    still_used = {
+        row[0] for row in db.query(ProductImage.url)
+        .filter(ProductImage.url.in_(urls))
+        .distinct()
+    }
+    paths: dict[Path, None] = {}
+    for ref in refs:
+        if ref["url"] in still_used:
+            continue
+        for path in (url_to_relative(ref["url"]), *variant_paths(ref.get("variants"))):
+            if path is not None:
+                paths[path] = None
+    return list(paths)
+
+
+def image_to_out(item: ProductImage | dict) -> ProductImageOut:
+    """ProductImageOut from an ORM row or from its stored ``model_dump()``."""
+
+    data = item if isinstance(item, dict) else {
+        "id": item.id, "url": item.url, "sort": item.sort,
+        "width": item.width, "height": item.height, "variants": item.variants,
+    }
+    variants = data.get("variants")
+    return ProductImageOut.model_construct(
+        id=data["id"],
+        url=data["url"],
+        sort=data["sort"],
+        width=data.get("width"),
+        height=data.get("height"),
+        variants=[ImageVariantOut.model_construct(**v) for v in variants] if variants else None,
+    )
+
+
 def product_to_out(product: Product, gallery: Sequence[ProductImage] | None = None) -> ProductOut:
-    gallery_list = list(gallery or [])
-    gallery_payload = [ProductImageOut(
-        id=item.id, url=item.url, sort=item.sort) for item in gallery_list]
+    # Rows come from the database and already match the schema, so the
+    # models are constructed without a second validation pass.
+    gallery_payload = [image_to_out(item) for item in gallery or ()]
     urls = [item.url for item in gallery_payload]
     if not urls:
         urls = _legacy_images(product.name)
-    return ProductOut(
+    return ProductOut.model_construct(
         id=product.id,
         name=product.name,
         description=product.description,
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import logging
+import re
+from typing import TypeVar
+
+from sqlalchemy import column, func, literal_column, select, table
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.product import Product
+
+
+logger = logging.getLogger(__name__)
+
+_Q = TypeVar("_Q")
+
+# Text search configuration used on Postgres: ``russian`` stems Cyrillic
+# words and falls back to the English stemmer for ASCII tokens, which suits
+# a catalog of mostly Latin brand names with Russian descriptions. The
+# ``products.search_vector`` column it is baked into comes from migration
+# 0011; changing it needs a new migration.
+PG_TS_CONFIG = "russian"
+
+_SEARCH_STATE = {"backend": "like"}
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_MAX_TOKENS = 8
+
+_SQLITE_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name, description ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO products_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+)
+
+_products_fts = table("products_fts", column("rowid"), column("rank"))
+
+
+def search_backend() -> str:
+    """Name of the active search backend: ``postgres``, ``fts5`` or ``like``."""
+
+    return _SEARCH_STATE["backend"]
+
+
+def ensure_search_index(engine: Engine) -> str:
+    """Pick the search backend for ``engine``, run after the migrations.
+
+    On Postgres this only checks that migration 0011 created
+    ``products.search_vector``. On SQLite the FTS5 table and its triggers
+    are created here if missing, because FTS5 is an optional build feature.
+    Safe to call on every startup. Databases without full-text support keep
+    the ``ILIKE`` fallback.
+    """
+
+    dialect = engine.dialect.name
+    try:
+        if dialect == "postgresql":
+            with engine.connect() as conn:
+                exists = conn.exec_driver_sql(
+                    "SELECT 1 FROM information_schema.columns "
+                    "WHERE table_schema = current_schema() AND table_name = 'products' "
+                    "AND column_name = 'search_vector'").first()
+            if exists:
+                backend = "postgres"
+            else:
+                logger.warning("products.search_vector is missing, using LIKE search")
+                backend = "like"
+        elif dialect == "sqlite":
+            with engine.begin() as conn:
+                exists = conn.exec_driver_sql(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'products_fts'").first()
+                if not exists:
+                    conn.exec_driver_sql(
+                        "CREATE VIRTUAL TABLE products_fts USING fts5("
+                        "name, description, content='products', content_rowid='id', "
+                        "tokenize='unicode61 remove_diacritics 2')")
+                    conn.exec_driver_sql(
+                        "INSERT INTO products_fts(products_fts, rank) "
+                        "VALUES ('rank', 'bm25(10.0, 1.0)')")
+                    conn.exec_driver_sql(
+                        "INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+                for ddl in _SQLITE_DDL:
+                    conn.exec_driver_sql(ddl)
+            backend = "fts5"
+        else:
+            backend = "like"
+    except Exception:
+        logger.exception("Full-text search setup failed, using LIKE search")
+        backend = "like"
+    _SEARCH_STATE["backend"] = backend
+    return backend
+
+
+def _tokens(q: str) -> list[str]:
+    return _TOKEN_RE.findall(q)[:_MAX_TOKENS]
+
+
+def apply_search(query: _Q, q: str) -> tuple[_Q, ColumnElement | None]:
+    """Restrict a ``Product`` query or select to rows matching ``q``.
+
+    Returns the filtered statement and a relevance expression (higher is
+    better), or ``None`` when the active backend cannot rank results.
+    Every token is matched as a prefix so search-as-you-type keeps working.
+    """
+
+    backend = _SEARCH_STATE["backend"]
+    tokens = _tokens(q)
+    if backend == "like" or not tokens:
+        return query.where(Product.name.ilike(f"%{q}%")), None
+
+    if backend == "postgres":
+        ts_query = func.to_tsquery(
+            PG_TS_CONFIG, " & ".join(f"{token}:*" for token in tokens))
+        vector = literal_column("products.search_vector")
+        return query.where(vector.op("@@")(ts_query)), func.ts_rank_cd(vector, ts_query)
+
+    match = " ".join('"' + token.replace('"', '""') + '"*' for token in tokens)
+    hits = (
+        select(
+            _products_fts.c.rowid.label("product_id"),
+            _products_fts.c.rank.label("rank"),
+        )
+        .where(literal_column("products_fts").op("MATCH")(match))
+        .subquery("search_hits")
+    )
+    # FTS5 ranks with bm25(), where lower scores are better matches.
+    return query.join(hits, hits.c.product_id == Product.id), -hits.c.rank
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from threading import Event, Lock
+from time import monotonic, time
+from typing import Awaitable, Callable, Hashable, Iterable
+import asyncio
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag derived from the encoded body."""
+
+    return f'"{blake2b(body, digest_size=12).hexdigest()}"'
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """Encoded response body with its validators."""
+
+    body: bytes
+    etag: str
+    # Wall-clock time the content last changed, for Last-Modified.
+    last_modified: float
+
+    @classmethod
+    def of(cls, body: bytes, last_modified: float | None = None) -> "CachedBody":
+        return cls(body=body, etag=body_etag(body),
+                   last_modified=time() if last_modified is None else last_modified)
+
+
+@dataclass(frozen=True)
+class _ResponseEntry:
+    expires_at: float
+    cached: CachedBody
+    tags: frozenset[str]
+
+
+@dataclass
+class _Flight:
+    done: Event = field(default_factory=Event)
+    cached: CachedBody | None = None
+
+
+class ResponseCache:
+    """In-process cache of pre-encoded JSON response bodies.
+
+    Entries carry tags (``product:42``, ``category:3``, ``inventory`` ...) and
+    are dropped by :meth:`purge` when a write touches one of them. Concurrent
+    misses on the same key are collapsed: one caller rebuilds the body while
+    the others wait for its result.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 4096, wait_seconds: float = 10.0):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.wait_seconds = wait_seconds
+        self._entries: dict[Hashable, _ResponseEntry] = {}
+        self._tag_index: dict[str, set[Hashable]] = defaultdict(set)
+        self._inflight: dict[Hashable, _Flight] = {}
+        # Flights of async callers; only touched from the event loop thread.
+        self._async_inflight: dict[Hashable, asyncio.Future] = {}
+        self._purges = 0
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> bytes | None:
+        cached = self.peek(key)
+        return cached.body if cached is not None else None
+
+    def peek(self, key: Hashable) -> CachedBody | None:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= monotonic():
+            return None
+        return entry.cached
+
+    def _store(self, key: Hashable, cached: CachedBody, tags: Iterable[str]) -> None:
+        tags = frozenset(tags)
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+                self._tag_index.clear()
+            self._entries[key] = _ResponseEntry(
+                expires_at=monotonic() + self.ttl_seconds, cached=cached, tags=tags)
+            for tag in tags:
+                self._tag_index[tag].add(key)
+
+    def _encode(self, key: Hashable, body: bytes) -> CachedBody:
+        # A rebuild with identical content keeps its Last-Modified time.
+        previous = self._entries.get(key)
+        if previous is not None and previous.cached.body == body:
+            return previous.cached
+        return CachedBody.of(body)
+
+    def get_or_build(
+        self,
+        key: Hashable,
+        build: Callable[[], tuple[bytes, Iterable[str]]],
+    ) -> bytes:
+        """Return the cached body for ``key`` or build it exactly once."""
+
+        return self.fetch(key, build).body
+
+    def fetch(
+        self,
+        key: Hashable,
+        build: Callable[[], tuple[bytes, Iterable[str]]],
+    ) -> CachedBody:
+        """Like :meth:`get_or_build` but also return the ETag and Last-Modified.
+
+        ``build`` returns the encoded body and its tags. If a purge happens
+        while it runs the fresh body is returned but not cached, since it may
+        already be stale.
+        """
+
+        cached = self.peek(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            purges_before = self._purges
+
+        if not leader:
+            flight.done.wait(self.wait_seconds)
+            if flight.cached is not None:
+                return flight.cached
+            # The leader failed or timed out; build independently.
+            body, _ = build()
+            return self._encode(key, body)
+
+        try:
+            body, tags = build()
+            cached = self._encode(key, body)
+            if self._purges == purges_before:
+                self._store(key, cached, tags)
+            flight.cached = cached
+            return cached
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    async def fetch_async(
+        self,
+        key: Hashable,
+        build: Callable[[], Awaitable[tuple[bytes, Iterable[str]]]],
+    ) -> CachedBody:
+        """:meth:`fetch` for coroutines: concurrent misses await the leader's
+        future instead of blocking the event loop on a thread event."""
+
+        cached = self.peek(key)
+        if cached is not None:
+            return cached
+
+        flight = self._async_inflight.get(key)
+        if flight is not None:
+            try:
+                cached = await asyncio.wait_for(asyncio.shield(flight), self.wait_seconds)
+            except asyncio.TimeoutError:
+                cached = None
+            if cached is not None:
+                return cached
+            # The leader failed or timed out; build independently.
+            body, _ = await build()
+            return self._encode(key, body)
+
+        flight = self._async_inflight[key] = asyncio.get_running_loop().create_future()
+        purges_before = self._purges
+        try:
+            body, tags = await build()
+            cached = self._encode(key, body)
+            if self._purges == purges_before:
+                self._store(key, cached, tags)
+            flight.set_result(cached)
+            return cached
+        finally:
+            self._async_inflight.pop(key, None)
+            if not flight.done():
+                flight.set_result(None)
+
+    def purge(self, *tags: str) -> None:
+        """Drop every entry carrying at least one of ``tags``."""
+
+        with self._lock:
+            self._purges += 1
+            for tag in tags:
+                for key in self._tag_index.pop(tag, ()):
+                    entry = self._entries.pop(key, None)
+                    if entry is None:
+                        continue
+                    for other in entry.tags:
+                        if other != tag:
+                            self._tag_index.get(other, set()).discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._purges += 1
+            self._entries.clear()
+            self._tag_index.clear()
+
+
+# Public catalog endpoints: product listing, product detail and categories.
+catalog_responses = ResponseCache()
+# Public site settings; purged by the settings admin routes.
+settings_responses = ResponseCache(ttl_seconds=300)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Mapping
+
+from sqlalchemy import case, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.product import Inventory
+
+
+class OutOfStock(ValueError):
+    """Raised when a product no longer has enough unreserved stock."""
+
+    def __init__(self, product_id: int):
+        super().__init__(f"Not enough stock for product {product_id}")
+        self.product_id = product_id
+
+
+def _per_product(amounts: Mapping[int, int]):
+    # SQL expression giving each inventory row its amount, 0 if not listed.
+    if not amounts:
+        return literal(0)
+    return case(dict(amounts), value=Inventory.product_id, else_=0)
+
+
+def _adjust_stock(
+    db: Session,
+    take: Mapping[int, int],
+    reserve: Mapping[int, int],
+    release: Mapping[int, int],
+) -> None:
+    ids = sorted(set(take) | set(reserve) | set(release))
+    if not ids:
+        return
+    # Lock in product id order so two transactions touching the same
+    # products always queue in the same order and cannot deadlock.
+    tracked = db.scalars(
+        select(Inventory.product_id)
+        .where(Inventory.product_id.in_(ids))
+        .order_by(Inventory.product_id)
+        .with_for_update()
+    ).all()
+    if not tracked:
+        return
+
+    taken, held, freed = _per_product(take), _per_product(reserve), _per_product(release)
+    # Reservations being given back never push reserved_stock below zero,
+    # even if an admin has reset it in the meantime.
+    kept = case((Inventory.reserved_stock >= freed, Inventory.reserved_stock - freed), else_=0)
+    wanted = taken + held
+    changed = set(db.scalars(
+        update(Inventory)
+        .where(
+            Inventory.product_id.in_(tracked),
+            or_(wanted == 0, Inventory.current_stock - kept >= wanted),
+        )
+        .values(current_stock=Inventory.current_stock - taken, reserved_stock=kept + held)
+        .returning(Inventory.product_id)
+        .execution_options(synchronize_session=False)
+    ))
+    for product_id in tracked:
+        if product_id not in changed:
+            raise OutOfStock(product_id)
+
+
+def take_stock(
+    db: Session,
+    quantities: Mapping[int, int],
+    released: Mapping[int, int] | None = None,
+) -> None:
+    """Subtract ``quantities`` (product id -> units) from ``current_stock``.
+
+    ``released`` are units the buyer had on hold (see ``app.services.cart_holds``);
+    they are taken off ``reserved_stock`` in the same statement, so a hold
+    turns into a sale without anyone else getting in between.
+
+    The inventory rows are first locked with ``SELECT ... FOR UPDATE`` in
+    product id order, then changed by a single ``UPDATE`` that only matches
+    rows whose ``current_stock - reserved_stock`` still covers the quantity.
+    The guard is re-checked by the database, so concurrent checkouts cannot
+    oversell (SQLite has no row locks but serialises writers, which gives the
+    same result).
+
+    Products without an inventory row are not tracked and are skipped. Raises
+    ``OutOfStock`` for the first product that falls short; the caller should
+    roll back, which also undoes the other changes.
+    """
+
+    _adjust_stock(db, take=quantities, reserve={}, release=released or {})
+
+
+def reserve_stock(
+    db: Session,
+    quantities: Mapping[int, int],
+    released: Mapping[int, int] | None = None,
+) -> None:
+    """Add ``quantities`` to ``reserved_stock`` if they are still available.
+
+    Same locking and guard as ``take_stock``; ``released`` is a previous
+    reservation being replaced. Raises ``OutOfStock``.
+    """
+
+    _adjust_stock(db, take={}, reserve=quantities, release=released or {})
+
+
+def release_stock(db: Session, quantities: Mapping[int, int]) -> None:
+    """Give reserved units back, one ``UPDATE`` for any number of products."""
+
+    _adjust_stock(db, take={}, reserve={}, release=quantities)
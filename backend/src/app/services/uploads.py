@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+from typing import BinaryIO, Iterable
+import os
+import re
+import tempfile
+
+from app.core.config import settings
+
+
+# Stored files named after the SHA-256 of their content (and derivatives
+# such as ``<hash>-400w``) never change, so their URLs can be cached forever.
+_CONTENT_HASH_RE = re.compile(r"^[0-9a-f]{64}(-\d+w)?$")
+_COPY_CHUNK = 1024 * 1024
+# Shared, content-addressed storage for uploaded images.
+CONTENT_FOLDER = Path("images")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MUTABLE_CACHE_CONTROL = "public, max-age=86400"
+
+
+def uploads_root() -> Path:
+    return Path(settings.UPLOADS_DIR).resolve()
+
+
+def url_to_relative(url: str) -> Path | None:
+    """``/uploads/products/1/x.jpg`` -> ``products/1/x.jpg`` (query ignored)."""
+
+    path = url.split("?", 1)[0].lstrip("/")
+    relative = Path(path)
+    if relative.parts and relative.parts[0] == "uploads":
+        relative = Path(*relative.parts[1:])
+    return relative if relative.parts else None
+
+
+def resolve_upload(relative: str | Path) -> Path | None:
+    """Absolute path of an existing file under ``UPLOADS_DIR``.
+
+    Returns ``None`` for missing files, directories and anything that would
+    escape the uploads root (``..``, absolute paths, symlinks pointing out).
+    """
+
+    root = uploads_root()
+    try:
+        candidate = (root / relative).resolve()
+    except (OSError, ValueError):
+        return None
+    if root not in candidate.parents or not candidate.is_file():
+        return None
+    return candidate
+
+
+def delete_upload_files(relatives: Iterable[Path | None]) -> None:
+    """Best-effort removal of files under ``UPLOADS_DIR``; errors are ignored."""
+
+    root = uploads_root()
+    for relative in relatives:
+        if relative is None:
+            continue
+        try:
+            (root / relative).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def is_content_addressed(path: str | Path) -> bool:
+    return bool(_CONTENT_HASH_RE.match(Path(path).stem))
+
+
+def cache_control_for(path: str | Path) -> str:
+    return IMMUTABLE_CACHE_CONTROL if is_content_addressed(path) else MUTABLE_CACHE_CONTROL
+
+
+class UploadTooLarge(ValueError):
+    """The upload exceeded the configured size limit."""
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    relative: Path
+    url: str
+    size: int
+    # False when identical content was already stored and got reused.
+    created: bool
+
+
+def store_content_addressed(source: BinaryIO, extension: str, max_bytes: int | None = None) -> StoredUpload:
+    """Copy ``source`` into shared storage under the SHA-256 of its bytes.
+
+    The file lands in ``CONTENT_FOLDER/<first two hex chars>/<hash><ext>``, so
+    the same photo uploaded for several products is stored once. Reads in
+    chunks and is blocking: call it from a worker thread. Raises
+    ``UploadTooLarge`` as soon as more than ``max_bytes`` have been read.
+    """
+
+    staging = uploads_root() / CONTENT_FOLDER
+    staging.mkdir(parents=True, exist_ok=True)
+    digest = sha256()
+    size = 0
+    fd, tmp_name = tempfile.mkstemp(dir=staging, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := source.read(_COPY_CHUNK):
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                buffer.write(chunk)
+        hexdigest = digest.hexdigest()
+        relative = CONTENT_FOLDER / hexdigest[:2] / f"{hexdigest}{extension}"
+        target = uploads_root() / relative
+        created = not target.exists()
+        if created:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_name, target)
+        else:
+            os.unlink(tmp_name)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return StoredUpload(relative=relative, url=f"/uploads/{relative.as_posix()}",
+                        size=size, created=created)